@@ -0,0 +1,111 @@
+import os
+import time
+
+from http_client import fetch_json
+
+
+# Point at a local replay_server.py to crawl offline.
+BASE_URL = os.environ.get("DAILY_BRIEF_BASE_URL", "https://thedailybrief.zerodha.com").rstrip("/")
+ARCHIVE_URL = BASE_URL + "/api/v1/archive?sort=new&limit={limit}&offset={offset}"
+
+MIN_LIMIT = 5
+MAX_LIMIT = 50
+START_LIMIT = 12
+# Pages answered faster than this grow the next request; slower ones shrink it.
+FAST_SECONDS = 1.5
+SLOW_SECONDS = 6.0
+PAGE_TIMEOUT = 15
+MAX_FAILURES = 4
+
+
+class ArchivePager:
+    """Iterates archive entries newest-first, one page at a time.
+
+    The page size doubles while responses stay fast and halves on errors,
+    timeouts or slow pages. While the caller works through a page, the next
+    one is already being fetched on a background thread.
+    """
+
+    def __init__(self, limit=START_LIMIT, min_limit=MIN_LIMIT, max_limit=MAX_LIMIT,
+                 max_items=None, prefetch=True, archive_url=ARCHIVE_URL):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, limit)
+        self.limit = max(min_limit, limit)
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.archive_url = archive_url
+        self.pages = 0
+        self.failures = 0
+
+    def fetch_page(self, offset, limit):
+        started = time.monotonic()
+        try:
+            entries = fetch_json(self.archive_url.format(limit=limit, offset=offset), timeout=PAGE_TIMEOUT, retries=1)
+        except Exception as error:
+            return None, time.monotonic() - started, error
+        if not isinstance(entries, list):
+            entries = []
+        return entries, time.monotonic() - started, None
+
+    def adapt(self, elapsed, error):
+        if error is not None or elapsed > SLOW_SECONDS:
+            self.limit = max(self.min_limit, self.limit // 2)
+        elif elapsed < FAST_SECONDS:
+            self.limit = min(self.max_limit, self.limit * 2)
+
+    def request_size(self, offset):
+        if self.max_items is None:
+            return self.limit
+        return max(1, min(self.limit, self.max_items - offset))
+
+    def __iter__(self):
+        executor = None
+        if self.prefetch:
+            # Imported here: it pulls in logging, which `check` has no use for.
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            yield from self._iterate(executor)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, executor, offset):
+        limit = self.request_size(offset)
+        if executor:
+            return executor.submit(self.fetch_page, offset, limit)
+        return self.fetch_page(offset, limit)
+
+    def _iterate(self, executor):
+        offset = 0
+        pending = self._submit(executor, offset)
+        while True:
+            entries, elapsed, error = pending.result() if executor else pending
+            self.adapt(elapsed, error)
+            if error is not None:
+                self.failures += 1
+                if self.failures >= MAX_FAILURES:
+                    raise error
+                pending = self._submit(executor, offset)
+                continue
+
+            self.failures = 0
+            self.pages += 1
+            if not entries:
+                return
+            if self.max_items is not None:
+                entries = entries[:self.max_items - offset]
+            offset += len(entries)
+
+            done = self.max_items is not None and offset >= self.max_items
+            if not done and executor:
+                pending = self._submit(executor, offset)
+            yield from entries
+            if done:
+                return
+            if not executor:
+                pending = self._submit(executor, offset)
+
+
+def iter_archive(**kwargs):
+    return iter(ArchivePager(**kwargs))
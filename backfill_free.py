@@ -1,194 +1,101 @@
-import json
 import os
-import re
-import time
-import urllib.request
-from datetime import datetime
-from html import unescape
-from html.parser import HTMLParser
-
-
-ARCHIVE_URL = "https://thedailybrief.zerodha.com/api/v1/archive?sort=new&limit={limit}&offset={offset}"
-
-
-def fetch(url):
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36",
-            "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=30) as response:
-        return response.read().decode("utf-8", errors="ignore")
-
-
-def fetch_json(url):
-    return json.loads(fetch(url))
-
-
-class ContentExtractor(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self.capture = False
-        self.capture_article = False
-        self.depth = 0
-        self.text = []
-        self.article_text = []
-
-    def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-        class_attr = attrs_dict.get("class", "")
-        if isinstance(class_attr, list):
-            class_attr = " ".join(class_attr)
-        class_attr = class_attr or ""
-
-        if tag == "article":
-            self.capture_article = True
-
-        if any(key in class_attr for key in [
-            "available-content",
-            "post-content",
-            "post-body",
-            "post-content-container",
-            "article-body",
-        ]):
-            self.capture = True
-            self.depth = 1
-            return
-
-        if self.capture:
-            self.depth += 1
-
-    def handle_endtag(self, tag):
-        if tag == "article":
-            self.capture_article = False
-        if self.capture:
-            self.depth -= 1
-            if self.depth <= 0:
-                self.capture = False
-
-    def handle_data(self, data):
-        if not data or not data.strip():
-            return
-        if self.capture:
-            self.text.append(data)
-        elif self.capture_article:
-            self.article_text.append(data)
-
-
-def normalize_text(text):
-    text = unescape(text)
-    text = text.replace("\xa0", " ")
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-
-def strip_boilerplate(text):
-    if not text:
-        return ""
-    patterns = [
-        r"our goal with the daily brief",
-        r"check out the audio",
-        r"spotify",
-        r"apple podcasts",
-        r"if you prefer video",
-        r"marketsbyzerodha",
-        r"thedailybriefing\.substack\.com",
-        r"this content is for informational purposes",
-        r"we publish a new episode every day",
-    ]
-    for pattern in patterns:
-        text = re.sub(pattern, " ", text, flags=re.I)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def extract_article_text(html):
-    parser = ContentExtractor()
-    parser.feed(html)
-    text = " ".join(parser.text).strip()
-    if not text:
-        text = " ".join(parser.article_text).strip()
-    return normalize_text(text)
-
-
-def extract_title(html):
-    match = re.search(r'<h1 class="post-title"[^>]*>(.*?)</h1>', html, flags=re.S | re.I)
-    if match:
-        return normalize_text(match.group(1))
-    match = re.search(r"<title>(.*?)</title>", html, flags=re.S | re.I)
-    return normalize_text(match.group(1)) if match else "Today I Learned"
-
-
-def build_learning(text):
-    cleaned = strip_boilerplate(text)
-    sentences = [s.strip() for s in cleaned.split(". ") if len(s.strip()) >= 60]
-    if sentences:
-        return ". ".join(sentences[:4]) + "."
-    return cleaned[:600]
-
-
-def load_existing():
+import queue
+import threading
+from itertools import chain
+
+from dates import normalize_date, utc_now
+from extraction import extract_title
+from failures import FailedQueue
+from parse_guard import fetch_article, quarantine
+from publish import publish
+from records import split_url
+from related import update_related
+from sources import DEFAULT_SOURCE, get_sources, source_for
+from store import insert_learning, load_learnings, new_learning, save_learnings, sort_learnings
+
+
+def crawl_source(source, pending, seen, results):
+    """Walks one source's archive on its own thread, queueing each outcome.
+
+    Each host has its own rate limiter (see sources.py), so a slow or
+    throttled source never holds up the others.
+    """
     try:
-        with open("learnings.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-    except FileNotFoundError:
-        pass
-    return []
-
-
-def main():
-    reset = os.environ.get("RESET") == "1"
-    existing = [] if reset else load_existing()
-    seen = {item.get("articleUrl") for item in existing if isinstance(item, dict)}
-    all_learnings = list(existing)
-
-    offset = 0
-    limit = 25
-    added = 0
-
-    while True:
-        archive = fetch_json(ARCHIVE_URL.format(limit=limit, offset=offset))
-        if not archive:
-            break
-
-        for article in archive:
+        # URLs that failed last run go first. The pager fetches the next
+        # archive page while this one is processed.
+        for article in chain(pending, source.iter_archive()):
             url = article.get("canonical_url")
-            if not url or url in seen:
+            if not url or split_url(url) in seen:
                 continue
-
+            seen.add(split_url(url))
             try:
-                html = fetch(url)
-                content = extract_article_text(html)
-                if not content:
-                    continue
-                learning = build_learning(content)
-                if not learning:
-                    continue
-                all_learnings.append({
-                    "learning": learning,
-                    "articleUrl": url,
-                    "title": extract_title(html),
-                    "date": article.get("post_date") or datetime.utcnow().isoformat(),
-                })
-                seen.add(url)
-                added += 1
-                time.sleep(1)
-            except Exception:
+                html, blocks = fetch_article(url, source)
+                learning = source.build_learning(blocks) if blocks else ""
+            except Exception as error:
+                results.put((source, article, None, None, error))
                 continue
+            results.put((source, article, learning, extract_title(html), None))
+    except Exception as error:
+        print(f"Stopped crawling {source.name}: {error}")
+    finally:
+        results.put(None)
 
-        offset += limit
-        time.sleep(2)
+
+def main():
+    reset = os.environ.get("RESET") == "1"
+    existing = [] if reset else load_learnings()
+    # Keyed by (interned prefix, slug) so the set shares the records' strings.
+    # Sources never share URLs, so their threads never race on a key.
+    seen = {(item.url_prefix, item.slug) for item in existing}
+    # Quarantined articles broke a parse budget before; don't fetch them again.
+    seen.update(split_url(url) for url in quarantine.urls())
+    all_learnings = sort_learnings(list(existing))
+
+    sources = get_sources()
+    failed = FailedQueue()
+    pending = {source.name: [] for source in sources}
+    for article in failed.pending():
+        pending[source_for(article["canonical_url"], sources).name].append(article)
+
+    results = queue.Queue()
+    for source in sources:
+        threading.Thread(
+            target=crawl_source, args=(source, pending[source.name], seen, results), daemon=True
+        ).start()
+
+    # Only this thread touches the store and the failed queue.
+    added = 0
+    empty = 0
+    running = len(sources)
+    while running:
+        item = results.get()
+        if item is None:
+            running -= 1
+            continue
+        source, article, learning, title, error = item
+        url = article["canonical_url"]
+        if error is not None:
+            failed.record(url, error, article.get("post_date", ""))
+            continue
+        failed.resolve(url)
+        if not learning:
+            empty += 1
+            continue
+
+        date = normalize_date(article.get("post_date")) or utc_now()
+        record = new_learning(learning, url, title, date)
+        if source.name != DEFAULT_SOURCE:
+            record.set("source", source.name)
+        insert_learning(all_learnings, record)
+        added += 1
 
     if added:
-        with open("learnings.json", "w", encoding="utf-8") as f:
-            json.dump(all_learnings, f, indent=2)
+        update_related(all_learnings)
+        save_learnings(all_learnings)
+        publish(all_learnings)
+    failed.save()
 
-    print(f"Backfill complete. Added {added} learnings.")
+    print(f"Backfill complete. Added {added} learnings, {empty} had no content, {failed.summary()}.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+Random-access export of the store: UTF-8 blobs plus fixed-width indexes,
+one pair per month like the store's partitions.
+
+BLOB_DIR/learnings-<month>.txt holds that month's learnings as one line of
+compact JSON each, in store order (newest first), and learnings-<month>.idx
+holds one ENTRY (little-endian uint64 byte offset, uint32 byte length) per
+learning, so a month's entry N sits at byte N * ENTRY.size.
+BLOB_DIR/index.json lists the shards in store order with their counts, so
+learning N of the whole store is found by walking the counts. Reading a
+learning costs two small reads whatever the size of the archive:
+index.html does them with HTTP Range requests, and BlobReader with slices
+of a memory map. A daily update rewrites only the current month's pair and
+the shard list, so the committed blob grows by what was added.
+
+    reader = BlobReader()
+    len(reader), reader[0]["title"]
+"""
+
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from itertools import groupby
+
+from store import partition_key
+
+
+BLOB_DIR = os.environ.get("BLOB_DIR", "blob")
+SHARDS_NAME = "index.json"
+ENTRY = struct.Struct("<QI")
+
+
+def shard_paths(key, directory=BLOB_DIR):
+    """(blob, index) paths of the shard for month ``key``."""
+    return f"{directory}/learnings-{key}.txt", f"{directory}/learnings-{key}.idx"
+
+
+def shards_path(directory=BLOB_DIR):
+    return f"{directory}/{SHARDS_NAME}"
+
+
+def split_shards(learnings):
+    """Return [(month key, count)] for ``learnings``, in store order."""
+    shards = [(key, sum(1 for _ in run)) for key, run in groupby(learnings, key=partition_key)]
+    if len({key for key, _ in shards}) != len(shards):
+        raise ValueError("Learnings are not sorted by date; run `python3 store.py normalize`")
+    return shards
+
+
+def render_shards(shards):
+    lines = ",\n".join("  " + json.dumps({"key": key, "count": count}) for key, count in shards)
+    return f'{{"shards":[\n{lines}\n]}}\n'
+
+
+def encode_record(learning):
+    return json.dumps(learning.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def build_blob(learnings):
+    """Return (blob, index) bytes for ``learnings``."""
+    blob = bytearray()
+    index = bytearray(ENTRY.size * len(learnings))
+    for i, learning in enumerate(learnings):
+        record = encode_record(learning)
+        # The stored length leaves out the newline separator.
+        ENTRY.pack_into(index, i * ENTRY.size, len(blob), len(record) - 1)
+        blob += record
+    return bytes(blob), bytes(index)
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class Shard:
+    def __init__(self, path, index_path):
+        self._blob = _map(path)
+        self._index = _map(index_path)
+        self.blob = memoryview(self._blob)
+        self.index = memoryview(self._index)
+
+    def raw(self, i):
+        offset, length = ENTRY.unpack_from(self.index, i * ENTRY.size)
+        return self.blob[offset:offset + length]
+
+    def close(self):
+        self.blob.release()
+        self.index.release()
+        for mapped in (self._blob, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+class BlobReader:
+    """Zero-copy access to the blob shards; a shard is mapped on first use."""
+
+    def __init__(self, directory=BLOB_DIR):
+        self.directory = directory
+        with open(shards_path(directory), "r", encoding="utf-8") as f:
+            self.shards = [(entry["key"], entry["count"]) for entry in json.load(f)["shards"]]
+        self.starts = []
+        total = 0
+        for _, count in self.shards:
+            self.starts.append(total)
+            total += count
+        self.total = total
+        self.mapped = {}
+
+    def __len__(self):
+        return self.total
+
+    def shard(self, n):
+        if n not in self.mapped:
+            self.mapped[n] = Shard(*shard_paths(self.shards[n][0], self.directory))
+        return self.mapped[n]
+
+    def raw(self, i):
+        """The bytes of learning ``i`` as a memoryview into the mapped blob."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("learning index out of range")
+        n = bisect_right(self.starts, i) - 1
+        return self.shard(n).raw(i - self.starts[n])
+
+    def get(self, i):
+        return json.loads(bytes(self.raw(i)))
+
+    __getitem__ = get
+
+    def close(self):
+        for shard in self.mapped.values():
+            shard.close()
+        self.mapped.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
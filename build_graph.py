@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+
+
+MANIFEST_PATH = "build-manifest.json"
+
+
+def content_hash(value):
+    if not isinstance(value, (bytes, str)):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha1(value).hexdigest()
+
+
+def write_if_changed(path, content):
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+class BuildGraph:
+    """Tracks which inputs each output was built from.
+
+    Every output is keyed by the hash of its dependency hashes. An output is
+    only re-rendered when that key differs from the one recorded in the
+    manifest (or the file is missing), so a run touches only what changed.
+    """
+
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self.previous = {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.previous = data.get("outputs", {})
+        except (FileNotFoundError, ValueError):
+            pass
+        self.outputs = {}
+        self.written = []
+        self.skipped = 0
+
+    def build(self, path, deps, render):
+        key = content_hash("\n".join(deps))
+        self.outputs[path] = key
+        if self.previous.get(path) == key and os.path.exists(path):
+            self.skipped += 1
+            return False
+        if write_if_changed(path, render()):
+            self.written.append(path)
+            return True
+        return False
+
+    def finish(self, prune=True):
+        if prune:
+            for path in sorted(set(self.previous) - set(self.outputs)):
+                if os.path.exists(path):
+                    os.remove(path)
+                    self.written.append(path)
+        manifest = {"outputs": dict(sorted(self.outputs.items()))}
+        write_if_changed(self.manifest_path, json.dumps(manifest, indent=2) + "\n")
+        return self.written
@@ -1,31 +1,29 @@
-import json
 import os
-import urllib.request
 
-
-ARCHIVE_URL = "https://thedailybrief.zerodha.com/api/v1/archive?sort=new&limit=5"
-
-
-def fetch_json(url):
-    with urllib.request.urlopen(url, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8", errors="ignore"))
+from archive_pager import iter_archive
+from dates import normalize_date
+from failures import FailedQueue
+from store import load_learnings
 
 
 def main():
-    data = fetch_json(ARCHIVE_URL)
-    new_url = data[0].get("canonical_url") if data else ""
+    latest = next(iter_archive(limit=5, max_items=1, prefetch=False), None) or {}
+    new_url = latest.get("canonical_url") or ""
+    new_date = normalize_date(latest.get("post_date"))
 
-    with open("learnings.json", "r", encoding="utf-8") as f:
-        learnings = json.load(f)
-    last_url = learnings[0].get("articleUrl") if isinstance(learnings, list) and learnings else ""
+    learnings = load_learnings()
+    last_url = learnings[0].article_url if learnings else ""
+    known = {item.article_url for item in learnings}
 
-    has_new = "true" if new_url and new_url != last_url else "false"
+    # Failed URLs from earlier runs also need process_new.py to run.
+    has_new = "true" if (new_url and new_url not in known) or len(FailedQueue()) else "false"
 
     output = os.environ.get("GITHUB_OUTPUT")
     if output:
         with open(output, "a", encoding="utf-8") as f:
             f.write(f"last_url={last_url}\n")
             f.write(f"new_url={new_url}\n")
+            f.write(f"new_date={new_date}\n")
             f.write(f"has_new={has_new}\n")
 
 
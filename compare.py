@@ -0,0 +1,120 @@
+"""
+Run every extractor over a corpus with one HTML parse per article.
+
+    python3 dailylearnings.py compare --input articles.jsonl --out-dir comparison
+
+Each article is parsed once into extraction blocks, and the same blocks are
+handed to every strategy's extract_learning(). Writes
+learnings-<strategy>.json per strategy plus report.json. The report holds
+per-strategy stats, pairwise paragraph overlap, and the articles where the
+strategies disagree on whether there is a learning at all.
+"""
+
+import json
+import os
+import time
+from itertools import combinations
+
+from corpus import iter_articles
+from extraction import extract_blocks
+from extractors import STRATEGIES, load_strategy
+
+
+# Disagreements listed in full in the report; the counts cover all of them.
+MAX_DIFFS = 200
+
+
+def load_strategies(names):
+    return {name: load_strategy(name) for name in names}
+
+
+def paragraphs_of(learning):
+    return set(learning["learning"].split("\n\n")) if learning else set()
+
+
+def overlap(a, b):
+    union = a | b
+    return len(a & b) / len(union) if union else 1.0
+
+
+def compare(input_path, out_dir, strategies=STRATEGIES):
+    modules = load_strategies(strategies)
+    outputs = {name: [] for name in strategies}
+    seconds = {name: 0.0 for name in strategies}
+    words = {name: 0 for name in strategies}
+    pair_overlap = {pair: 0.0 for pair in combinations(strategies, 2)}
+    pair_count = {pair: 0 for pair in pair_overlap}
+    disagreements = []
+    disagreement_count = 0
+    parse_seconds = 0.0
+    total = 0
+
+    for article in iter_articles(input_path):
+        total += 1
+        started = time.perf_counter()
+        blocks = extract_blocks(article.get("content", "") or "", containers=None)
+        parse_seconds += time.perf_counter() - started
+
+        results = {}
+        for name, module in modules.items():
+            started = time.perf_counter()
+            results[name] = module.extract_learning(article, blocks)
+            seconds[name] += time.perf_counter() - started
+            if results[name]:
+                outputs[name].append(results[name])
+                words[name] += len(results[name]["learning"].split())
+
+        for a, b in pair_overlap:
+            if results[a] and results[b]:
+                pair_overlap[(a, b)] += overlap(paragraphs_of(results[a]), paragraphs_of(results[b]))
+                pair_count[(a, b)] += 1
+
+        produced = [name for name in strategies if results[name]]
+        if 0 < len(produced) < len(strategies):
+            disagreement_count += 1
+            if len(disagreements) < MAX_DIFFS:
+                disagreements.append({
+                    "url": article.get("url", ""),
+                    "title": article.get("title", ""),
+                    "produced": produced,
+                    "skipped": [name for name in strategies if not results[name]],
+                })
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in strategies:
+        with open(os.path.join(out_dir, f"learnings-{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(outputs[name], f, indent=2, ensure_ascii=False)
+
+    report = {
+        "articles": total,
+        "parse_seconds": round(parse_seconds, 3),
+        "strategies": {
+            name: {
+                "learnings": len(outputs[name]),
+                "coverage": round(len(outputs[name]) / total, 3) if total else 0,
+                "mean_words": round(words[name] / len(outputs[name]), 1) if outputs[name] else 0,
+                "seconds": round(seconds[name], 3),
+            }
+            for name in strategies
+        },
+        "paragraph_overlap": {
+            f"{a}/{b}": round(pair_overlap[(a, b)] / pair_count[(a, b)], 3) if pair_count[(a, b)] else None
+            for a, b in pair_overlap
+        },
+        "disagreements": disagreement_count,
+        "disagreement_samples": disagreements,
+    }
+    with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    print(f"{total} articles, parsed once in {parse_seconds:.2f}s")
+    print(f"{'strategy':<10} {'learnings':>9} {'coverage':>9} {'words':>7} {'seconds':>8}")
+    for name, stats in report["strategies"].items():
+        print(f"{name:<10} {stats['learnings']:>9} {stats['coverage']:>9.1%} "
+              f"{stats['mean_words']:>7} {stats['seconds']:>8.2f}")
+    for pair, value in report["paragraph_overlap"].items():
+        print(f"overlap {pair}: {value if value is not None else '-'}")
+    print(f"{disagreement_count} articles where only some strategies produced a learning")
+    print(f"Report written to {os.path.join(out_dir, 'report.json')}")
+    return report
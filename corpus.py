@@ -0,0 +1,14 @@
+import json
+
+
+def iter_articles(path):
+    """Yield articles from a JSON list or a JSONL file (one article per line)."""
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    yield from articles
@@ -0,0 +1,129 @@
+"""
+The whole daily job in one process: check the archive, fetch and extract
+anything new, then save and publish once.
+
+The archive requests (one per source) and the store load run concurrently,
+and the newest posts start downloading as soon as the archive answers, even if the store
+(and so the set of known URLs) is still loading. Each download is extracted
+on its worker thread as soon as it arrives. The store is read once and
+written once.
+"""
+
+import asyncio
+import os
+
+from dates import normalize_date
+from failures import FailedQueue
+from parse_guard import quarantine
+from process_new import process_url
+from publish import publish
+from related import update_related
+from seed_learnings import SEED_COUNT
+from sources import get_sources
+from store import insert_learning, load_learnings, save_learnings
+
+
+# Look a few posts back so a day with several posts (or a missed run)
+# doesn't leave any behind.
+LOOKBACK = 3
+# Below this many learnings the store is seeded from the latest SEED_COUNT posts.
+SEED_BELOW = 5
+
+
+def latest_posts(source, count):
+    try:
+        entries = source.iter_archive(limit=max(5, count), max_items=count, prefetch=False)
+        return [
+            {"canonical_url": entry["canonical_url"], "post_date": normalize_date(entry.get("post_date"))}
+            for entry in entries
+            if entry.get("canonical_url")
+        ]
+    except Exception as error:
+        print(f"Could not read the {source.name} archive: {error}")
+        return []
+
+
+def write_github_output(values):
+    output = os.environ.get("GITHUB_OUTPUT")
+    if not output:
+        return
+    with open(output, "a", encoding="utf-8") as f:
+        for key, value in values.items():
+            f.write(f"{key}={value}\n")
+
+
+async def ingest(target):
+    try:
+        # Fetch and extract on a worker thread so the other downloads keep going.
+        learning = await asyncio.to_thread(process_url, target["canonical_url"], target.get("post_date", ""))
+        return target, learning, None
+    except Exception as error:
+        return target, None, error
+
+
+async def run():
+    failed = FailedQueue()
+    targets = failed.pending()
+    quarantined = quarantine.urls()
+    store_task = asyncio.create_task(asyncio.to_thread(load_learnings))
+    # SEED_COUNT posts cost one request per source, and cover seeding an
+    # empty store. Every source's archive is read at once.
+    archives = await asyncio.gather(*(
+        asyncio.to_thread(latest_posts, source, SEED_COUNT) for source in get_sources()
+    ))
+
+    known = None
+    tasks = {}
+
+    def start(candidates):
+        for target in candidates:
+            url = target["canonical_url"]
+            if url not in tasks and (known is None or url not in known):
+                tasks[url] = asyncio.create_task(ingest(target))
+
+    if store_task.done():
+        known = {item.article_url for item in store_task.result()} | quarantined
+    # Without a known-URL set yet this is speculative: the downloads overlap
+    # the rest of the store load, and known posts are dropped afterwards.
+    start(targets)
+    for posts in archives:
+        start(posts[:LOOKBACK])
+    learnings = await store_task
+    known = {item.article_url for item in learnings} | quarantined
+    if len(learnings) < SEED_BELOW:
+        for posts in archives:
+            start(posts)
+
+    added = 0
+    for finished in asyncio.as_completed(list(tasks.values())):
+        target, learning, error = await finished
+        url = target["canonical_url"]
+        if url in known:
+            failed.resolve(url)
+            continue
+        if error is not None:
+            failed.record(url, error, target.get("post_date", ""))
+            print(f"Failed to fetch {url}: {error}")
+            continue
+        failed.resolve(url)
+        if learning:
+            insert_learning(learnings, learning)
+            known.add(url)
+            added += 1
+
+    failed.save()
+    if added:
+        update_related(learnings)
+        save_learnings(learnings)
+        publish(learnings)
+    write_github_output({"added": added, "has_new": "true" if added else "false"})
+    print(f"Added {added} new learnings ({failed.summary()}).")
+    return added
+
+
+def main():
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+dailylearnings - single entry point for the learning pipeline
+
+    python3 dailylearnings.py daily
+    python3 dailylearnings.py check
+    python3 dailylearnings.py process --url URL [--date DATE]
+    python3 dailylearnings.py backfill [--reset] [--delay SECONDS]
+    python3 dailylearnings.py seed
+    python3 dailylearnings.py extract --strategy smart --input articles.jsonl --output out.json
+    python3 dailylearnings.py compare --input articles.jsonl --out-dir comparison
+    python3 dailylearnings.py features build|select [--strategy smart] [--set min_length=90]
+    python3 dailylearnings.py publish
+    python3 dailylearnings.py watch [--interval SECONDS] [--exec CMD]
+    python3 dailylearnings.py bench extract|crawl
+    python3 dailylearnings.py site-files
+    python3 dailylearnings.py --profile [FILE] <command> ...
+
+Subcommand modules are imported only when that subcommand runs, so `check`
+doesn't pay for the HTML parsers or the publisher.
+Paths are relative to --root and can be overridden with --learnings or the
+LEARNINGS_PATH, FAILED_URLS_PATH, ARTICLES_PATH and DAILY_BRIEF_BASE_URL
+environment variables. --profile runs any command under profiling.py and
+writes collapsed stacks for a flamegraph.
+"""
+
+import argparse
+import os
+import sys
+
+from extractors import ARTICLES_PATH, OUTPUT_PATH, ROOT, STRATEGIES, run_strategy
+
+
+# Everything a run can write that the site serves or the next run reads:
+# the workflows and watch --exec commit exactly these.
+SITE_FILES = (
+    "data", "blob", "deltas",
+    "feed.xml", "feed.xml.gz", "atom.xml", "atom.xml.gz", "feed.json", "feed.json.gz", "feed-state.json",
+    "sw.js", "precache-manifest.json", "topics.json", "topics-state.json",
+    "index.html", "archive.html", "learning", "build-manifest.json",
+    "failed_urls.json", "quarantine.jsonl",
+)
+
+
+def cmd_daily(args):
+    import daily_update
+    daily_update.main()
+
+
+def cmd_check(args):
+    import check_new
+    check_new.main()
+
+
+def cmd_process(args):
+    if args.url:
+        os.environ["NEW_URL"] = args.url
+    if args.date:
+        os.environ["NEW_DATE"] = args.date
+    import process_new
+    process_new.main()
+
+
+def cmd_backfill(args):
+    if args.reset:
+        os.environ["RESET"] = "1"
+    if args.delay is not None:
+        os.environ["CRAWL_DELAY"] = str(args.delay)
+    import backfill_free
+    backfill_free.main()
+
+
+def cmd_seed(args):
+    import seed_learnings
+    seed_learnings.main()
+
+
+def cmd_extract(args):
+    input_path = args.input or ARTICLES_PATH
+    output_path = args.output or OUTPUT_PATH
+    run_strategy(args.strategy, input_path, output_path)
+
+
+def cmd_compare(args):
+    import compare
+    input_path = args.input or ARTICLES_PATH
+    compare.compare(input_path, args.out_dir)
+
+
+def cmd_features(args):
+    import features
+    if args.action == "build":
+        input_path = args.input or ARTICLES_PATH
+        features.build(input_path, args.cache or features.FEATURES_PATH)
+    else:
+        features.select(args.strategy, features.parse_overrides(args.set),
+                        args.cache or features.FEATURES_PATH, args.output)
+
+
+def cmd_publish(args):
+    import publish
+    publish.main()
+
+
+def cmd_watch(args):
+    import watch
+    watch.watch(interval=args.interval or watch.WATCH_INTERVAL, hook=args.exec, polls=args.polls)
+
+
+def bench_extract(args):
+    import contextlib
+    import tempfile
+    import time
+    import tracemalloc
+
+    from corpus import iter_articles
+    from synth_corpus import iter_synthetic, write_corpus
+
+    strategies = STRATEGIES if args.strategy == "all" else (args.strategy,)
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.input
+        if not corpus:
+            corpus = os.path.join(tmp, "corpus.jsonl")
+            write_corpus(corpus, iter_synthetic(args.count, args.seed))
+        articles = sum(1 for _ in iter_articles(corpus))
+
+        def run(name):
+            output = os.path.join(tmp, f"learnings-{name}.json")
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                run_strategy(name, corpus, output)
+
+        print(f"{articles} articles")
+        print(f"{'strategy':<10} {'seconds':>9} {'articles/s':>11} {'peak MB':>9}")
+        for name in strategies:
+            # tracemalloc slows allocation-heavy code several times over, so
+            # time and peak memory come from separate runs.
+            started = time.perf_counter()
+            run(name)
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            run(name)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<10} {elapsed:>9.2f} {articles / elapsed:>11.1f} {peak / 1e6:>9.1f}")
+
+
+def bench_crawl(args):
+    import statistics
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from replay_server import make_server
+
+    server = make_server(port=0, posts=args.count, latency_ms=args.latency_ms,
+                         jitter_ms=args.latency_ms / 2, error_rate=args.error_rate, seed=args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["DAILY_BRIEF_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    from archive_pager import iter_archive
+    from extraction import build_learning, extract_blocks
+    from http_client import fetch
+
+    def crawl_one(url):
+        started = time.perf_counter()
+        try:
+            build_learning(extract_blocks(fetch(url)))
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    urls = [article["canonical_url"] for article in iter_archive(max_items=args.count)]
+    listed = time.perf_counter() - started
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        latencies = list(pool.map(crawl_one, urls))
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    done = sorted(latency for latency in latencies if latency is not None)
+    print(f"Archive: {len(urls)} entries in {listed:.2f}s")
+    print(f"Crawled: {len(done)}/{len(urls)} articles in {elapsed:.2f}s "
+          f"({len(done) / elapsed:.1f} articles/s, {args.workers} workers)")
+    if done:
+        p95 = done[min(len(done) - 1, int(len(done) * 0.95))]
+        print(f"Latency: p50 {statistics.median(done) * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms")
+
+
+def cmd_site_files(args):
+    print(" ".join(SITE_FILES))
+
+
+def cmd_bench(args):
+    if args.target == "crawl":
+        bench_crawl(args)
+    else:
+        bench_extract(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="dailylearnings", description="Today I Learned pipeline")
+    parser.add_argument("--root", help="site directory holding the store and the HTML (default: cwd)")
+    parser.add_argument("--learnings", help="store directory, or a .json file for a single-file store (default: LEARNINGS_PATH or data)")
+    parser.add_argument("--profile", nargs="?", const="profile.folded", metavar="FILE",
+                        help="profile the command and write collapsed stacks to FILE (default: profile.folded)")
+    parser.add_argument("--profile-top", type=int, default=20, metavar="N",
+                        help="functions to list in the profile report")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daily = commands.add_parser("daily", help="seed, check, fetch and publish in one pass (the daily CI job)")
+    daily.set_defaults(func=cmd_daily)
+
+    check = commands.add_parser("check", help="look for a new archive post (writes GITHUB_OUTPUT)")
+    check.set_defaults(func=cmd_check)
+
+    process = commands.add_parser("process", help="ingest a new article and publish")
+    process.add_argument("--url", help="article URL (default: NEW_URL)")
+    process.add_argument("--date", help="archive post date (default: NEW_DATE)")
+    process.set_defaults(func=cmd_process)
+
+    backfill = commands.add_parser("backfill", help="ingest every archive post not yet in the store")
+    backfill.add_argument("--reset", action="store_true", help="start from an empty store")
+    backfill.add_argument("--delay", type=float, help="seconds between article fetches (default: CRAWL_DELAY or 1)")
+    backfill.set_defaults(func=cmd_backfill)
+
+    seed = commands.add_parser("seed", help="seed a near-empty store from the latest posts")
+    seed.set_defaults(func=cmd_seed)
+
+    extract = commands.add_parser("extract", help="run an offline extractor over a saved corpus")
+    extract.add_argument("--strategy", choices=STRATEGIES, default="perfect")
+    extract.add_argument("--input", help="articles JSON/JSONL (default: ARTICLES_PATH)")
+    extract.add_argument("--output", help="learnings JSON to write (default: EXTRACT_OUTPUT or extracted.json)")
+    extract.set_defaults(func=cmd_extract)
+
+    comparison = commands.add_parser("compare", help="run every extractor over a corpus, parsing each article once")
+    comparison.add_argument("--input", help="articles JSON/JSONL (default: ARTICLES_PATH)")
+    comparison.add_argument("--out-dir", default="comparison", help="where per-strategy outputs and report.json go")
+    comparison.set_defaults(func=cmd_compare)
+
+    feats = commands.add_parser("features", help="cache per-paragraph features and re-tune extractor thresholds")
+    feats.add_argument("action", choices=("build", "select"))
+    feats.add_argument("--input", help="build: articles JSON/JSONL (default: ARTICLES_PATH)")
+    feats.add_argument("--cache", help="feature cache file (default: FEATURES_PATH or features.cache)")
+    feats.add_argument("--strategy", choices=("smart", "perfect"), default="perfect")
+    feats.add_argument("--set", action="append", metavar="KEY=VALUE", help="select: override a threshold")
+    feats.add_argument("--output", help="select: write the selected learnings here")
+    feats.set_defaults(func=cmd_features)
+
+    publish = commands.add_parser("publish", help="render pages for the current store")
+    publish.set_defaults(func=cmd_publish)
+
+    watching = commands.add_parser("watch", help="poll the archives and ingest new posts as they appear")
+    watching.add_argument("--interval", type=float, help="seconds between polls (default: WATCH_INTERVAL or 60)")
+    watching.add_argument("--exec", metavar="CMD", help="shell command to run after each publish (e.g. commit and push)")
+    watching.add_argument("--polls", type=int, default=0, help="stop after this many polls (default: run until interrupted)")
+    watching.set_defaults(func=cmd_watch)
+
+    bench = commands.add_parser("bench", help="measure extractor or crawl throughput offline")
+    bench.add_argument("target", nargs="?", choices=("extract", "crawl"), default="extract")
+    bench.add_argument("--count", type=int, default=500, help="synthetic articles to generate")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--input", help="extract: use this corpus instead of a synthetic one")
+    bench.add_argument("--strategy", choices=STRATEGIES + ("all",), default="all")
+    bench.add_argument("--workers", type=int, default=8, help="crawl: concurrent fetches")
+    bench.add_argument("--latency-ms", type=float, default=20, help="crawl: simulated server latency")
+    bench.add_argument("--error-rate", type=float, default=0.0, help="crawl: simulated error rate")
+    bench.set_defaults(func=cmd_bench)
+
+    site_files = commands.add_parser("site-files", help="list the paths a run writes, for `git add`")
+    site_files.set_defaults(func=cmd_site_files)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.learnings:
+        os.environ["LEARNINGS_PATH"] = os.path.abspath(args.learnings)
+    if args.profile:
+        args.profile = os.path.abspath(args.profile)
+    if args.root:
+        os.chdir(args.root)
+    # Pipeline modules live next to this file, whatever the working directory.
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if args.profile:
+        from profiling import run_profiled
+        run_profiled(lambda: args.func(args), args.profile, args.profile_top)
+    else:
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
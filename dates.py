@@ -0,0 +1,58 @@
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+CANONICAL_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+TEXT_FORMATS = [
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+]
+
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        date = value
+    else:
+        value = re.sub(r"\s+", " ", str(value or "")).strip()
+        if not value:
+            return None
+        date = None
+        try:
+            date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+        if date is None:
+            for fmt in TEXT_FORMATS:
+                try:
+                    date = datetime.strptime(value, fmt)
+                    break
+                except ValueError:
+                    continue
+        if date is None:
+            try:
+                date = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def normalize_date(value):
+    date = parse_date(value)
+    return date.strftime(CANONICAL_FORMAT) if date else ""
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime(CANONICAL_FORMAT)
+
+
+def timestamp(value):
+    date = parse_date(value)
+    return date.timestamp() if date else None
@@ -0,0 +1,108 @@
+"""
+Versioned changelog of the store, so returning visitors only download what
+changed since their last visit.
+
+Every publish that changes any learning bumps the corpus version and writes
+deltas/<version>.json:
+
+    {"version": 8, "previous": 7,
+     "removed": ["old-slug", ...],
+     "added": [[0, {...learning...}], [3, {...}], ...]}
+
+To apply a delta, drop every learning whose slug is in "removed" or among
+the added records, then insert each added record at its index, in order.
+Edited learnings appear in both lists, and a delta applies cleanly to a copy
+that already has it. deltas/manifest.json names the current version, and
+"since" is the oldest version the retained deltas can bring up to date.
+Older copies reload the full corpus from blob/.
+
+deltas/state.json records the slug and content hash of every learning at
+the current version, which is what the next delta is computed against.
+"""
+
+import json
+import os
+
+from build_graph import write_if_changed
+
+
+DELTAS_DIR = "deltas"
+MANIFEST_PATH = f"{DELTAS_DIR}/manifest.json"
+STATE_PATH = f"{DELTAS_DIR}/state.json"
+# Visitors away for longer than this many updates reload the full corpus.
+MAX_DELTAS = 60
+
+
+def delta_path(version):
+    return f"{DELTAS_DIR}/{version}.json"
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state["version"], state["since"], [tuple(entry) for entry in state["records"]]
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return 0, 0, None
+
+
+def diff(old, new):
+    """Return (removed slugs, added indices) turning ``old`` into ``new``.
+
+    Both are lists of (slug, hash). Returns None when the lists can't be
+    expressed as a delta (duplicate slugs, or learnings that only moved).
+    """
+    new_slugs = [slug for slug, _ in new]
+    if len(set(new_slugs)) != len(new_slugs) or len({slug for slug, _ in old}) != len(old):
+        return None
+    before = dict(old)
+    added = [i for i, (slug, digest) in enumerate(new) if before.get(slug) != digest]
+    dropped = {slug for slug, _ in old} - set(new_slugs)
+    touched = dropped | {new_slugs[i] for i in added}
+    # Replay the delta on the old order to make sure it lands on the new one.
+    result = [slug for slug, _ in old if slug not in touched]
+    for i in added:
+        result.insert(i, new_slugs[i])
+    if result != new_slugs:
+        return None
+    removed = sorted(slug for slug, _ in old if slug in touched)
+    return removed, added
+
+
+def publish_deltas(learnings, hashes, slugs):
+    """Write the delta for this publish, if anything changed; returns written paths."""
+    version, since, old = load_state()
+    new = list(zip(slugs, hashes))
+    if old == new:
+        return []
+
+    version += 1
+    written = []
+    oldest = max(since, version - MAX_DELTAS)
+    change = diff(old, new) if old is not None else None
+    if change is None:
+        # No usable history: every copy older than this reloads in full.
+        oldest = version
+    else:
+        removed, added = change
+        delta = {
+            "version": version,
+            "previous": version - 1,
+            "removed": removed,
+            "added": [[i, learnings[i].to_dict()] for i in added],
+        }
+        write_if_changed(delta_path(version), json.dumps(delta, ensure_ascii=False, separators=(",", ":")))
+        written.append(delta_path(version))
+
+    for stale in range(since + 1, oldest + 1):
+        if os.path.exists(delta_path(stale)):
+            os.remove(delta_path(stale))
+            written.append(delta_path(stale))
+    since = oldest
+
+    manifest = {"version": version, "since": since, "count": len(learnings)}
+    write_if_changed(MANIFEST_PATH, json.dumps(manifest) + "\n")
+    state = {"version": version, "since": since, "records": [list(entry) for entry in new]}
+    write_if_changed(STATE_PATH, json.dumps(state, separators=(",", ":")) + "\n")
+    written += [MANIFEST_PATH, STATE_PATH]
+    return written
@@ -6,44 +6,21 @@ Extracts quality learnings from Daily Brief articles using smart heuristics
 
 import json
 import re
-from html.parser import HTMLParser
-from html import unescape
+import sys
 
+from corpus import iter_articles
+from extraction import extract_blocks, split_sentences
+from extractors import ARTICLES_PATH, OUTPUT_PATH
 
-class TextExtractor(HTMLParser):
-    """Extract text from HTML, ignoring scripts, styles, etc."""
 
-    def __init__(self):
-        super().__init__()
-        self.text_parts = []
-        self.skip = False
-
-    def handle_starttag(self, tag, attrs):
-        if tag in ['script', 'style', 'iframe', 'noscript']:
-            self.skip = True
-
-    def handle_endtag(self, tag):
-        if tag in ['script', 'style', 'iframe', 'noscript']:
-            self.skip = False
-        elif tag in ['p', 'div', 'li', 'h1', 'h2', 'h3']:
-            self.text_parts.append('\n')
-
-    def handle_data(self, data):
-        if not self.skip:
-            self.text_parts.append(data)
-
-    def get_text(self):
-        return ' '.join(self.text_parts)
+def blocks_to_text(blocks):
+    """Join parsed blocks into plain text, one block per line"""
+    return '\n'.join(block.text for block in blocks)
 
 
 def html_to_text(html):
-    """Convert HTML to plain text"""
-    extractor = TextExtractor()
-    extractor.feed(html)
-    text = extractor.get_text()
-    text = unescape(text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    """Convert HTML to plain text, one block per line"""
+    return blocks_to_text(extract_blocks(html, containers=None))
 
 
 def is_boilerplate(text):
@@ -109,8 +86,8 @@ def extract_paragraphs(text):
     content_start = find_content_start(text)
     text = text[content_start:]
 
-    # Split by sentence-ending punctuation followed by space
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # Split into sentences, keeping abbreviations like "Rs. 500" intact
+    sentences = split_sentences(text)
 
     # Group sentences into paragraphs
     paragraphs = []
@@ -183,59 +160,62 @@ def create_learning(paragraphs, article_title):
     }
 
 
-def process_articles(input_file, output_file):
-    """Process all articles and extract learnings"""
-    print(f'Loading articles from {input_file}...')
+def extract_learning(article, blocks=None):
+    """Build the learning for one article, or None if it has too little content.
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+    Pass ``blocks`` if the article HTML is already parsed, to skip parsing it again.
+    """
+    content_html = article.get('content', '')
+    if not content_html or len(content_html) < 500:
+        return None
 
-    print(f'Found {len(articles)} articles')
+    # Extract text from HTML
+    if blocks is None:
+        blocks = extract_blocks(content_html, containers=None)
+    text = blocks_to_text(blocks)
+    if len(text) < 300:
+        return None
 
-    learnings = []
-    skipped = 0
+    # Get good paragraphs
+    paragraphs = extract_paragraphs(text)
+    if len(paragraphs) < 1:
+        return None
 
-    for i, article in enumerate(articles):
-        # Get basic info
-        url = article.get('url', '')
-        title = article.get('title', 'Untitled')
-        date = article.get('date', '')
-        content_html = article.get('content', '')
+    # Create learning
+    learning = create_learning(paragraphs, article.get('title', 'Untitled'))
+    if not learning:
+        return None
 
-        if not content_html or len(content_html) < 500:
-            skipped += 1
-            continue
+    return {
+        'learning': learning['learning'],
+        'title': learning['title'],
+        'articleUrl': article.get('url', ''),
+        'date': article.get('date', '')
+    }
 
-        # Extract text from HTML
-        text = html_to_text(content_html)
 
-        if len(text) < 300:
-            skipped += 1
-            continue
+def process_articles(input_file, output_file):
+    """Process all articles and extract learnings"""
+    print(f'Loading articles from {input_file}...')
 
-        # Get good paragraphs
-        paragraphs = extract_paragraphs(text)
+    learnings = []
+    skipped = 0
+    total = 0
 
-        if len(paragraphs) < 1:
+    # Streamed so JSONL corpora of any size never load at once
+    for i, article in enumerate(iter_articles(input_file)):
+        total += 1
+        learning = extract_learning(article)
+        if learning is None:
             skipped += 1
             continue
 
-        # Create learning
-        learning = create_learning(paragraphs, title)
-
-        if learning:
-            learnings.append({
-                'learning': learning['learning'],
-                'title': learning['title'],
-                'articleUrl': url,
-                'date': date
-            })
-
-            if (i + 1) % 50 == 0:
-                print(f'  Processed {i + 1}/{len(articles)}... ({len(learnings)} good, {skipped} skipped)')
+        learnings.append(learning)
+        if (i + 1) % 50 == 0:
+            print(f'  Processed {i + 1}... ({len(learnings)} good, {skipped} skipped)')
 
     print(f'\nDone!')
-    print(f'  Total articles: {len(articles)}')
+    print(f'  Total articles: {total}')
     print(f'  Quality learnings: {len(learnings)}')
     print(f'  Skipped: {skipped}')
 
@@ -247,7 +227,8 @@ def process_articles(input_file, output_file):
 
 
 if __name__ == '__main__':
+    # Usage: extract-free.py [articles.json|articles.jsonl] [output.json]
     process_articles(
-        '/home/krishna.lohia/articles-full-content.json',
-        '/home/krishna.lohia/daily-learnings/learnings.json'
+        sys.argv[1] if len(sys.argv) > 1 else ARTICLES_PATH,
+        sys.argv[2] if len(sys.argv) > 2 else OUTPUT_PATH
     )
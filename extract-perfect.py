@@ -5,74 +5,61 @@ Perfect learning extractor - gets straight to the good content
 
 import json
 import re
-from html.parser import HTMLParser
-
-
-class ParagraphExtractor(HTMLParser):
-    """Extract only <p> tag content from HTML"""
-    def __init__(self):
-        super().__init__()
-        self.paragraphs = []
-        self.current_p = []
-        self.in_p = False
-        self.skip_tags = {'script', 'style', 'iframe', 'noscript', 'svg'}
-        self.skip_depth = 0
-
-    def handle_starttag(self, tag, attrs):
-        if tag in self.skip_tags:
-            self.skip_depth += 1
-        elif tag == 'p' and self.skip_depth == 0:
-            self.in_p = True
-            self.current_p = []
-
-    def handle_endtag(self, tag):
-        if tag in self.skip_tags:
-            self.skip_depth = max(0, self.skip_depth - 1)
-        elif tag == 'p' and self.in_p:
-            self.in_p = False
-            text = ' '.join(self.current_p).strip()
-            if text:
-                self.paragraphs.append(text)
-
-    def handle_data(self, data):
-        if self.in_p and self.skip_depth == 0:
-            self.current_p.append(data.strip())
+import sys
+
+from corpus import iter_articles
+from extraction import HEADING, extract_blocks
+from extractors import ARTICLES_PATH, OUTPUT_PATH, THRESHOLDS
+
+
+LIMITS = THRESHOLDS['perfect']
+
+
+def block_paragraphs(blocks):
+    """Paragraph, list and quote text from parsed blocks, skipping headings"""
+    return [block.text for block in blocks if block.kind != HEADING]
+
+
+def extract_paragraphs(html):
+    """Extract paragraph, list and quote text from HTML, skipping headings"""
+    return block_paragraphs(extract_blocks(html, containers=None))
+
+
+# Obvious intro patterns
+INTRO_PHRASES = [
+    'our goal with the daily brief',
+    'listen to the podcast',
+    'watch the videos',
+    'spotify',
+    'apple podcasts',
+    'youtube',
+    'in today\'s edition',
+    'in this edition',
+    'welcome to',
+    'i\'m your host',
+    'for those of you who are new',
+    'just a quick heads-up',
+    'heads up before we dive',
+    'ipo is open now',
+    'you can read the full story',
+    'check out',
+    'read full story',
+    'share this post',
+    'leave a comment',
+    'subscribe',
+    'substack',
+]
 
 
 def is_intro_fluff(para):
     """Check if paragraph is intro/promotional fluff"""
     para_lower = para.lower()
 
-    # Obvious intro patterns
-    intro_phrases = [
-        'our goal with the daily brief',
-        'listen to the podcast',
-        'watch the videos',
-        'spotify',
-        'apple podcasts',
-        'youtube',
-        'in today\'s edition',
-        'in this edition',
-        'welcome to',
-        'i\'m your host',
-        'for those of you who are new',
-        'just a quick heads-up',
-        'heads up before we dive',
-        'ipo is open now',
-        'you can read the full story',
-        'check out',
-        'read full story',
-        'share this post',
-        'leave a comment',
-        'subscribe',
-        'substack',
-    ]
-
-    if any(phrase in para_lower for phrase in intro_phrases):
+    if any(phrase in para_lower for phrase in INTRO_PHRASES):
         return True
 
     # Short paragraphs that are just section headers
-    if len(para) < 60:
+    if len(para) < LIMITS['min_fluff_length']:
         return True
 
     # Check if it's mostly a list of topics (like "In today's edition: X, Y, Z")
@@ -85,36 +72,33 @@ def is_intro_fluff(para):
 def is_good_content(para):
     """Check if paragraph is actual valuable content"""
     # Must be substantial
-    if len(para) < 100:
+    if len(para) < LIMITS['min_length']:
         return False
 
     # Must have enough actual words
     words = para.split()
-    if len(words) < 20:
+    if len(words) < LIMITS['min_words']:
         return False
 
     # Must be mostly letters (not code/data)
     letters = sum(c.isalpha() or c.isspace() for c in para)
-    if letters < len(para) * 0.75:
+    if letters < len(para) * LIMITS['min_alpha']:
         return False
 
     # Should have multiple sentences
     sentence_endings = para.count('. ') + para.count('? ') + para.count('! ')
-    if sentence_endings < 1 and len(para) < 250:
+    if sentence_endings < LIMITS['min_sentences'] and len(para) <= LIMITS['long_length']:
         return False
 
     return True
 
 
-def extract_content_paragraphs(html):
-    """Extract good content paragraphs, skipping all intro fluff"""
-    parser = ParagraphExtractor()
-    parser.feed(html)
-
+def extract_content_paragraphs(paragraphs):
+    """Pick good content paragraphs, skipping all intro fluff"""
     good_paragraphs = []
     found_real_content = False
 
-    for para in parser.paragraphs:
+    for para in paragraphs:
         # Skip intro fluff
         if is_intro_fluff(para):
             continue
@@ -130,7 +114,7 @@ def extract_content_paragraphs(html):
                 good_paragraphs.append(para)
 
         # Stop once we have enough
-        if len(good_paragraphs) >= 8:
+        if len(good_paragraphs) >= LIMITS['max_paragraphs']:
             break
 
     return good_paragraphs
@@ -138,7 +122,7 @@ def extract_content_paragraphs(html):
 
 def create_learning(paragraphs, title):
     """Create a learning from good paragraphs"""
-    if not paragraphs or len(paragraphs) < 2:
+    if not paragraphs or len(paragraphs) < LIMITS['min_paragraphs']:
         return None
 
     # Take first 5-7 paragraphs
@@ -177,54 +161,61 @@ def create_learning(paragraphs, title):
     }
 
 
-def main():
-    print('Loading articles...')
-    with open('/home/krishna.lohia/articles-full-content.json', 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+def extract_learning(article, blocks=None):
+    """Build the learning for one article, or None if it has too little content.
 
-    print(f'Found {len(articles)} articles\n')
+    Pass ``blocks`` if the article HTML is already parsed, to skip parsing it again.
+    """
+    content_html = article.get('content', '')
+    if not content_html or len(content_html) < LIMITS['min_html']:
+        return None
 
-    learnings = []
-    skipped = 0
+    if blocks is None:
+        blocks = extract_blocks(content_html, containers=None)
 
-    for i, article in enumerate(articles):
-        url = article.get('url', '')
-        title = article.get('title', 'Untitled')
-        date = article.get('date', '')
-        content_html = article.get('content', '')
+    # Extract content paragraphs
+    paragraphs = extract_content_paragraphs(block_paragraphs(blocks))
+    if len(paragraphs) < LIMITS['min_paragraphs']:
+        return None
 
-        if not content_html or len(content_html) < 1000:
-            skipped += 1
-            continue
+    # Create learning
+    learning = create_learning(paragraphs, article.get('title', 'Untitled'))
+    if not learning or len(learning['learning']) <= LIMITS['min_learning']:
+        return None
 
-        # Extract content paragraphs
-        paragraphs = extract_content_paragraphs(content_html)
+    return {
+        'learning': learning['learning'],
+        'title': learning['title'],
+        'articleUrl': article.get('url', ''),
+        'date': article.get('date', '')
+    }
 
-        if len(paragraphs) < 2:
-            skipped += 1
-            continue
 
-        # Create learning
-        learning = create_learning(paragraphs, title)
+def main(input_path=ARTICLES_PATH, output_path=OUTPUT_PATH):
+    print(f'Loading articles from {input_path}...\n')
+
+    learnings = []
+    skipped = 0
+    total = 0
 
-        if learning and len(learning['learning']) > 300:
-            learnings.append({
-                'learning': learning['learning'],
-                'title': learning['title'],
-                'articleUrl': url,
-                'date': date
-            })
+    # Streamed so JSONL corpora of any size never load at once
+    for i, article in enumerate(iter_articles(input_path)):
+        total += 1
+        learning = extract_learning(article)
+        if learning is None:
+            skipped += 1
+            continue
 
-            if (i + 1) % 25 == 0:
-                print(f'Processed {i + 1}/{len(articles)}... ({len(learnings)} good, {skipped} skipped)')
+        learnings.append(learning)
+        if (i + 1) % 25 == 0:
+            print(f'Processed {i + 1}... ({len(learnings)} good, {skipped} skipped)')
 
     print(f'\n✓ Done!')
-    print(f'  Total articles: {len(articles)}')
+    print(f'  Total articles: {total}')
     print(f'  Quality learnings: {len(learnings)}')
     print(f'  Skipped: {skipped}')
 
     # Save
-    output_path = '/home/krishna.lohia/daily-learnings/learnings.json'
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(learnings, f, indent=2, ensure_ascii=False)
 
@@ -239,4 +230,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    # Usage: extract-*.py [articles.json|articles.jsonl] [output.json]
+    main(*sys.argv[1:3])
@@ -5,91 +5,76 @@ Smart learning extractor - extracts actual valuable content from articles
 
 import json
 import re
-from html.parser import HTMLParser
-
-
-class ParagraphExtractor(HTMLParser):
-    """Extract paragraphs from HTML"""
-    def __init__(self):
-        super().__init__()
-        self.paragraphs = []
-        self.current_p = []
-        self.in_p = False
-        self.skip_tags = {'script', 'style', 'iframe', 'noscript'}
-        self.skip_depth = 0
-
-    def handle_starttag(self, tag, attrs):
-        if tag in self.skip_tags:
-            self.skip_depth += 1
-        elif tag == 'p' and self.skip_depth == 0:
-            self.in_p = True
-            self.current_p = []
-
-    def handle_endtag(self, tag):
-        if tag in self.skip_tags:
-            self.skip_depth = max(0, self.skip_depth - 1)
-        elif tag == 'p' and self.in_p:
-            self.in_p = False
-            text = ' '.join(self.current_p).strip()
-            if text:
-                self.paragraphs.append(text)
-
-    def handle_data(self, data):
-        if self.in_p and self.skip_depth == 0:
-            self.current_p.append(data.strip())
+import sys
+
+from corpus import iter_articles
+from extraction import HEADING, extract_blocks
+from extractors import ARTICLES_PATH, OUTPUT_PATH, THRESHOLDS
+
+
+LIMITS = THRESHOLDS['smart']
+
+
+def block_paragraphs(blocks):
+    """Paragraph texts from parsed blocks, skipping headings"""
+    return [block.text for block in blocks if block.kind != HEADING]
+
+
+def extract_paragraphs(html):
+    """Extract paragraphs from HTML, keeping inline markup inside its paragraph"""
+    return block_paragraphs(extract_blocks(html, containers=None))
+
+
+BOILERPLATE_PHRASES = [
+    'our goal with the daily brief',
+    'listen to the podcast',
+    'spotify',
+    'apple podcasts',
+    'watch the videos on youtube',
+    'in today\'s edition',
+    'in this edition',
+    'welcome to',
+    'i\'m your host',
+    'for those of you who are new',
+    'share this post',
+    'leave a comment',
+    'subscribe',
+    'privacy',
+    'terms',
+    'collection notice',
+]
 
 
 def is_boilerplate(para):
     """Check if paragraph is boilerplate"""
     para_lower = para.lower()
-    boilerplate = [
-        'our goal with the daily brief',
-        'listen to the podcast',
-        'spotify',
-        'apple podcasts',
-        'watch the videos on youtube',
-        'in today\'s edition',
-        'in this edition',
-        'welcome to',
-        'i\'m your host',
-        'for those of you who are new',
-        'share this post',
-        'leave a comment',
-        'subscribe',
-        'privacy',
-        'terms',
-        'collection notice',
-    ]
-    return any(bp in para_lower for bp in boilerplate)
+    return any(bp in para_lower for bp in BOILERPLATE_PHRASES)
 
 
 def is_substantial(para):
     """Check if paragraph has substantial content"""
-    if len(para) < 80:  # Too short
+    if len(para) < LIMITS['min_length']:  # Too short
         return False
-    if len(para) > 2000:  # Too long (probably includes unwanted content)
+    if len(para) > LIMITS['max_length']:  # Too long (probably includes unwanted content)
         return False
 
     # Check if mostly letters (not metadata/junk)
     letters = sum(c.isalpha() or c.isspace() for c in para)
-    if letters < len(para) * 0.7:
+    if letters < len(para) * LIMITS['min_alpha']:
         return False
 
     # Check if it's a real paragraph (has multiple sentences or is long)
     sentences = para.count('. ') + para.count('? ') + para.count('! ')
-    if sentences >= 2 or len(para) > 200:
+    if sentences >= LIMITS['min_sentences'] or len(para) > LIMITS['long_length']:
         return True
 
     return False
 
 
-def extract_good_paragraphs(html, max_paragraphs=8):
-    """Extract good content paragraphs from HTML"""
-    parser = ParagraphExtractor()
-    parser.feed(html)
-
+def extract_good_paragraphs(paragraphs, max_paragraphs=LIMITS['max_paragraphs']):
+    """Pick good content paragraphs"""
     good_paras = []
-    for para in parser.paragraphs:
+    for para in paragraphs:
         # Skip boilerplate
         if is_boilerplate(para):
             continue
@@ -143,54 +128,61 @@ def create_learning(paragraphs, title):
     }
 
 
-def main():
-    print('Loading articles...')
-    with open('/home/krishna.lohia/articles-full-content.json', 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+def extract_learning(article, blocks=None):
+    """Build the learning for one article, or None if it has too little content.
 
-    print(f'Found {len(articles)} articles\n')
+    Pass ``blocks`` if the article HTML is already parsed, to skip parsing it again.
+    """
+    content_html = article.get('content', '')
+    if not content_html or len(content_html) < LIMITS['min_html']:
+        return None
 
-    learnings = []
-    skipped = 0
+    if blocks is None:
+        blocks = extract_blocks(content_html, containers=None)
 
-    for i, article in enumerate(articles):
-        url = article.get('url', '')
-        title = article.get('title', 'Untitled')
-        date = article.get('date', '')
-        content_html = article.get('content', '')
+    # Extract good paragraphs
+    paragraphs = extract_good_paragraphs(block_paragraphs(blocks))
+    if len(paragraphs) < LIMITS['min_paragraphs']:
+        return None
 
-        if not content_html or len(content_html) < 1000:
-            skipped += 1
-            continue
+    # Create learning
+    learning = create_learning(paragraphs, article.get('title', 'Untitled'))
+    if not learning or len(learning['learning']) <= LIMITS['min_learning']:
+        return None
 
-        # Extract good paragraphs
-        paragraphs = extract_good_paragraphs(content_html)
+    return {
+        'learning': learning['learning'],
+        'title': learning['title'],
+        'articleUrl': article.get('url', ''),
+        'date': article.get('date', '')
+    }
 
-        if len(paragraphs) < 3:
-            skipped += 1
-            continue
 
-        # Create learning
-        learning = create_learning(paragraphs, title)
+def main(input_path=ARTICLES_PATH, output_path=OUTPUT_PATH):
+    print(f'Loading articles from {input_path}...\n')
+
+    learnings = []
+    skipped = 0
+    total = 0
 
-        if learning and len(learning['learning']) > 200:
-            learnings.append({
-                'learning': learning['learning'],
-                'title': learning['title'],
-                'articleUrl': url,
-                'date': date
-            })
+    # Streamed so JSONL corpora of any size never load at once
+    for i, article in enumerate(iter_articles(input_path)):
+        total += 1
+        learning = extract_learning(article)
+        if learning is None:
+            skipped += 1
+            continue
 
-            if (i + 1) % 25 == 0:
-                print(f'Processed {i + 1}/{len(articles)}... ({len(learnings)} good, {skipped} skipped)')
+        learnings.append(learning)
+        if (i + 1) % 25 == 0:
+            print(f'Processed {i + 1}... ({len(learnings)} good, {skipped} skipped)')
 
     print(f'\n✓ Done!')
-    print(f'  Total articles: {len(articles)}')
+    print(f'  Total articles: {total}')
     print(f'  Quality learnings: {len(learnings)}')
     print(f'  Skipped: {skipped}')
 
     # Save
-    output_path = '/home/krishna.lohia/daily-learnings/learnings.json'
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(learnings, f, indent=2, ensure_ascii=False)
 
@@ -204,4 +196,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    # Usage: extract-*.py [articles.json|articles.jsonl] [output.json]
+    main(*sys.argv[1:3])
@@ -0,0 +1,240 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from html import unescape
+from html.parser import HTMLParser
+
+from dates import normalize_date
+
+
+HEADING = "heading"
+PARAGRAPH = "paragraph"
+LIST_ITEM = "list_item"
+QUOTE = "quote"
+
+Block = namedtuple("Block", "kind text")
+
+CONTAINER_CLASSES = [
+    "available-content",
+    "post-content",
+    "post-body",
+    "post-content-container",
+    "article-body",
+]
+
+BLOCK_TAGS = {
+    "h1": HEADING,
+    "h2": HEADING,
+    "h3": HEADING,
+    "h4": HEADING,
+    "h5": HEADING,
+    "h6": HEADING,
+    "p": PARAGRAPH,
+    "pre": PARAGRAPH,
+    "li": LIST_ITEM,
+    "blockquote": QUOTE,
+}
+# Substack content containers are always one of these; any other tag is never
+# checked for a container class, so its attributes are never looked at.
+CONTAINER_TAGS = {"div", "section", "article", "main"}
+SKIP_TAGS = {"script", "style", "iframe", "noscript", "svg", "button", "form", "figcaption"}
+# Void elements never get an end tag, so they must not move the depth counter.
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+BOILERPLATE_PATTERNS = [
+    r"our goal with the daily brief",
+    r"check out the audio",
+    r"spotify",
+    r"apple podcasts",
+    r"if you prefer video",
+    r"marketsbyzerodha",
+    r"thedailybriefing\.substack\.com",
+    r"this content is for informational purposes",
+    r"we publish a new episode every day",
+]
+BOILERPLATE_RE = re.compile("|".join(BOILERPLATE_PATTERNS), flags=re.I)
+
+ABBREVIATIONS = ["Rs", "U.S", "U.K", "Mr", "Mrs", "Ms", "Dr", "Ltd", "Inc", "vs", "approx", "e.g", "i.e", "etc"]
+# Split after sentence punctuation, unless the word before the period is a known
+# abbreviation ("Rs. 500", "the U.S. economy"). One lookbehind per abbreviation,
+# since lookbehinds must be fixed-width.
+SENTENCE_SPLIT_RE = re.compile(
+    r"(?<=[.!?])" + "".join(r"(?<!\b" + re.escape(a) + r"\.)" for a in ABBREVIATIONS) + r"\s+"
+)
+
+
+class BlockExtractor(HTMLParser):
+    """Turns article HTML into a stream of typed blocks in one pass.
+
+    Headings, paragraphs, list items and quotes each become one Block, with
+    inline markup flattened into their text. Only text inside a Substack
+    content container is kept (falling back to <article>), unless
+    ``containers`` is None, in which case the whole document is used.
+    """
+
+    def __init__(self, containers=CONTAINER_CLASSES):
+        super().__init__()
+        self.containers = containers
+        self.container_classes = frozenset(containers or ())
+        self.capture = containers is None
+        self.capture_article = False
+        self.depth = 0
+        self.skip_depth = 0
+        self.block_kind = None
+        self.block_tag = None
+        self.block_depth = 0
+        self.parts = []
+        self.blocks = []
+        self.article_blocks = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.parts.append(" ")
+            return
+
+        if tag == "article":
+            self.capture_article = True
+
+        if self.containers is not None:
+            if self.capture:
+                self.depth += 1
+            elif tag in CONTAINER_TAGS and self.is_container(attrs):
+                self.close_block()
+                self.capture = True
+                self.depth = 1
+
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == self.block_tag:
+            self.block_depth += 1
+        elif tag in BLOCK_TAGS and self.block_tag is None and (self.capture or self.capture_article):
+            self.close_block()
+            self.block_kind = BLOCK_TAGS[tag]
+            self.block_tag = tag
+            self.block_depth = 1
+
+    def is_container(self, attrs):
+        for name, value in attrs:
+            if name == "class" and value:
+                return not self.container_classes.isdisjoint(value.split())
+        return False
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == self.block_tag:
+            self.block_depth -= 1
+            if self.block_depth <= 0:
+                self.close_block()
+
+        if tag == "article":
+            self.close_block()
+            self.capture_article = False
+
+        if self.containers is not None and self.capture:
+            self.depth -= 1
+            if self.depth <= 0:
+                self.close_block()
+                self.capture = False
+
+    def handle_data(self, data):
+        if self.skip_depth or not (self.capture or self.capture_article):
+            return
+        if self.block_tag is None and not data.strip():
+            return
+        self.parts.append(data)
+
+    def close_block(self):
+        # Text outside any block tag (bare text in a <div>) becomes a paragraph.
+        # The parser has already decoded entities, so only whitespace is folded.
+        text = " ".join("".join(self.parts).split()) if self.parts else ""
+        if text:
+            target = self.blocks if self.capture else self.article_blocks
+            target.append(Block(self.block_kind or PARAGRAPH, text))
+        self.parts = []
+        self.block_kind = None
+        self.block_tag = None
+        self.block_depth = 0
+
+    def close(self):
+        super().close()
+        self.close_block()
+
+
+@lru_cache(maxsize=None)
+def container_pattern(containers):
+    tokens = "|".join(re.escape(c) for c in containers)
+    tags = "|".join(sorted(CONTAINER_TAGS))
+    return re.compile(
+        rf"<(?:{tags})\b[^>]*?\bclass\s*=\s*[\"']?[^\"'>]*?(?<![\w-])(?:{tokens})(?![\w-])",
+        flags=re.I,
+    )
+
+
+def extract_blocks(html, containers=CONTAINER_CLASSES):
+    # Nothing before the first container is kept, so start parsing there
+    # instead of tokenizing the page chrome; fall back to the whole page if
+    # that finds nothing (e.g. content only in an <article>).
+    if containers is not None:
+        match = container_pattern(tuple(containers)).search(html)
+        if match and match.start():
+            blocks = extract_blocks(html[match.start():], containers)
+            if blocks:
+                return blocks
+    parser = BlockExtractor(containers)
+    parser.feed(html)
+    parser.close()
+    return parser.blocks or parser.article_blocks
+
+
+def normalize_text(text):
+    text = unescape(text)
+    text = text.replace("\xa0", " ")
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def is_boilerplate(text, pattern=BOILERPLATE_RE):
+    return pattern.search(text) is not None
+
+
+def split_sentences(text):
+    return [s for s in SENTENCE_SPLIT_RE.split(text) if s]
+
+
+def render_block(block):
+    return f"• {block.text}" if block.kind == LIST_ITEM else block.text
+
+
+def extract_article_text(html):
+    return " ".join(block.text for block in extract_blocks(html))
+
+
+def extract_title(html):
+    match = re.search(r'<h1 class="post-title"[^>]*>(.*?)</h1>', html, flags=re.S | re.I)
+    if match:
+        return normalize_text(match.group(1))
+    match = re.search(r"<title>(.*?)</title>", html, flags=re.S | re.I)
+    return normalize_text(match.group(1)) if match else "Today I Learned"
+
+
+def extract_date(html):
+    match = re.search(r"<time[^>]*datetime=\"([^\"]+)\"", html, flags=re.S | re.I)
+    if match:
+        return normalize_date(match.group(1))
+    match = re.search(r"<meta[^>]*property=\"article:published_time\"[^>]*content=\"([^\"]+)\"", html, flags=re.S | re.I)
+    if match:
+        return normalize_date(match.group(1))
+    return ""
+
+
+def build_learning(blocks, max_blocks=4, boilerplate=BOILERPLATE_RE):
+    content = [block for block in blocks if block.kind != HEADING and not is_boilerplate(block.text, boilerplate)]
+    selected = [render_block(block) for block in content if len(block.text) >= 60]
+    if selected:
+        return "\n\n".join(selected[:max_blocks])
+    return " ".join(block.text for block in content)[:600]
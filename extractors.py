@@ -0,0 +1,73 @@
+"""
+The offline extractors (extract-free.py, extract-smart.py, extract-perfect.py)
+and what they share with the CLI, compare.py and features.py.
+
+The scripts' file names aren't importable, so load_strategy() loads them by
+path. THRESHOLDS holds the paragraph limits of the smart and perfect
+extractors: the scripts read their own entry, and features.py tunes copies
+of the same dicts, so a threshold is only ever written down once.
+"""
+
+import os
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STRATEGIES = ("free", "smart", "perfect")
+ARTICLES_PATH = os.environ.get("ARTICLES_PATH", "articles-full-content.json")
+# Not LEARNINGS_PATH: that names the pipeline's store, which these offline
+# scripts must never overwrite.
+OUTPUT_PATH = os.environ.get("EXTRACT_OUTPUT", "extracted.json")
+
+# A paragraph passes when sentences >= min_sentences or length > long_length.
+# "exclude" and "skip_topic_lists" name the phrase test each script applies,
+# for features.py; max_length and min_words of 0 mean no limit.
+THRESHOLDS = {
+    "smart": {
+        "min_html": 1000,
+        "exclude": "boilerplate",
+        "skip_topic_lists": False,
+        "min_fluff_length": 0,
+        "min_length": 80,
+        "max_length": 2000,
+        "min_words": 0,
+        "min_alpha": 0.7,
+        "min_sentences": 2,
+        "long_length": 200,
+        "max_paragraphs": 8,
+        "min_paragraphs": 3,
+        "min_learning": 200,
+    },
+    "perfect": {
+        "min_html": 1000,
+        "exclude": "intro",
+        "skip_topic_lists": True,
+        "min_fluff_length": 60,
+        "min_length": 100,
+        "max_length": 0,
+        "min_words": 20,
+        "min_alpha": 0.75,
+        "min_sentences": 1,
+        "long_length": 249,
+        "max_paragraphs": 8,
+        "min_paragraphs": 2,
+        "min_learning": 300,
+    },
+}
+
+
+def load_strategy(name):
+    import importlib.util
+
+    path = os.path.join(ROOT, f"extract-{name}.py")
+    spec = importlib.util.spec_from_file_location(f"extract_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_strategy(name, input_path, output_path):
+    module = load_strategy(name)
+    if name == "free":
+        module.process_articles(input_path, output_path)
+    else:
+        module.main(input_path, output_path)
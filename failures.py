@@ -0,0 +1,56 @@
+import json
+import os
+
+from dates import utc_now
+
+
+FAILED_PATH = os.environ.get("FAILED_URLS_PATH", "failed_urls.json")
+# Give up on a URL after it has failed this many runs in a row.
+MAX_ATTEMPTS = 5
+
+
+class FailedQueue:
+    """URLs that failed in a previous run, persisted so the next run retries them first."""
+
+    def __init__(self, path=FAILED_PATH):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def __len__(self):
+        return len(self.pending())
+
+    def pending(self):
+        return [
+            {"canonical_url": url, "post_date": entry.get("post_date", "")}
+            for url, entry in self.entries.items()
+            if entry.get("attempts", 0) < MAX_ATTEMPTS
+        ]
+
+    def record(self, url, error, post_date=""):
+        entry = self.entries.setdefault(url, {"attempts": 0})
+        entry["attempts"] += 1
+        entry["error"] = f"{type(error).__name__}: {error}"[:300]
+        entry["last_failed"] = utc_now()
+        if post_date:
+            entry["post_date"] = post_date
+
+    def resolve(self, url):
+        self.entries.pop(url, None)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.entries.items())), f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        given_up = len(self.entries) - len(self.pending())
+        return f"{len(self.pending())} queued for retry, {given_up} given up"
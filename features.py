@@ -0,0 +1,230 @@
+"""
+Per-paragraph quality features, computed once and cached in columns, so the
+extractor thresholds can be re-tuned without re-parsing the corpus.
+
+    python3 dailylearnings.py features build --input articles.jsonl
+    python3 dailylearnings.py features select --strategy smart --set min_length=90
+    python3 dailylearnings.py features select --strategy perfect --output extracted.json
+
+`build` parses every article once and writes one array per feature (length,
+words, letters, sentences, boilerplate and intro phrase hits, topic-list
+flag, position) plus the paragraph text to FEATURES_PATH. `select` applies a
+strategy's thresholds to whole columns at a time and, with --output, writes
+the same learnings the extract-*.py script would.
+"""
+
+import json
+import os
+import time
+from array import array
+from itertools import repeat
+from operator import ge, gt, le, lt, mul
+
+from corpus import iter_articles
+from extractors import THRESHOLDS, load_strategy
+
+
+FEATURES_PATH = os.environ.get("FEATURES_PATH", "features.cache")
+MAGIC = b"DLFEAT1\n"
+
+# name -> array typecode. Counts are unsigned ints, flags are bytes.
+COLUMNS = {
+    "article": "I",
+    "position": "I",
+    "length": "I",
+    "words": "I",
+    "letters": "I",
+    "sentences": "I",
+    "boilerplate": "B",
+    "intro": "B",
+    "topic_list": "B",
+    "text_end": "Q",
+}
+
+
+def paragraph_features(para, boilerplate_phrases, intro_phrases):
+    lower = para.lower()
+    return (
+        len(para),
+        len(para.split()),
+        sum(c.isalpha() or c.isspace() for c in para),
+        para.count(". ") + para.count("? ") + para.count("! "),
+        sum(phrase in lower for phrase in boilerplate_phrases),
+        sum(phrase in lower for phrase in intro_phrases),
+        int(lower.startswith("in ") and ":" in para and para.count(",") > 2),
+    )
+
+
+class FeatureCache:
+    """Columnar per-paragraph features plus the paragraph text they describe."""
+
+    def __init__(self, columns=None, articles=None, text=b""):
+        self.columns = columns or {name: array(code) for name, code in COLUMNS.items()}
+        self.articles = articles or []
+        self.text = text
+
+    def __len__(self):
+        return len(self.columns["article"])
+
+    @classmethod
+    def build(cls, articles):
+        smart = load_strategy("smart")
+        perfect = load_strategy("perfect")
+        cache = cls()
+        columns = cache.columns
+        text = bytearray()
+        for index, article in enumerate(articles):
+            html = article.get("content", "") or ""
+            cache.articles.append({
+                "url": article.get("url", ""),
+                "title": article.get("title", "Untitled"),
+                "date": article.get("date", ""),
+                "html_length": len(html),
+            })
+            for position, para in enumerate(smart.extract_paragraphs(html)):
+                values = paragraph_features(para, smart.BOILERPLATE_PHRASES, perfect.INTRO_PHRASES)
+                columns["article"].append(index)
+                columns["position"].append(position)
+                for name, value in zip(("length", "words", "letters", "sentences",
+                                        "boilerplate", "intro", "topic_list"), values):
+                    columns[name].append(min(value, 255) if COLUMNS[name] == "B" else value)
+                text += para.encode("utf-8")
+                columns["text_end"].append(len(text))
+        cache.text = bytes(text)
+        return cache
+
+    def save(self, path=FEATURES_PATH):
+        header = {
+            "columns": [[name, self.columns[name].typecode, len(self.columns[name])] for name in COLUMNS],
+            "articles": self.articles,
+            "text_length": len(self.text),
+        }
+        data = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(data).to_bytes(8, "little"))
+            f.write(data)
+            for name in COLUMNS:
+                self.columns[name].tofile(f)
+            f.write(self.text)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=FEATURES_PATH):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a feature cache")
+            size = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(size))
+            columns = {}
+            for name, typecode, count in header["columns"]:
+                column = array(typecode)
+                column.fromfile(f, count)
+                columns[name] = column
+            text = f.read(header["text_length"])
+        return cls(columns, header["articles"], text)
+
+    def paragraph(self, i):
+        start = self.columns["text_end"][i - 1] if i else 0
+        return self.text[start:self.columns["text_end"][i]].decode("utf-8")
+
+    def mask(self, profile):
+        """Bitmask (one byte per paragraph) of paragraphs passing ``profile``.
+
+        Each test maps a C-level comparison over a whole column; the byte
+        strings are then combined as big integers, so no Python code runs
+        per paragraph.
+        """
+        c = self.columns
+
+        def test(op, column, value):
+            return int.from_bytes(bytes(map(op, column, repeat(value))), "big")
+
+        length = c["length"]
+        keep = test(ge, length, profile["min_length"])
+        if profile["max_length"]:
+            keep &= test(le, length, profile["max_length"])
+        if profile["min_words"]:
+            keep &= test(ge, c["words"], profile["min_words"])
+        if profile["min_fluff_length"]:
+            keep &= test(ge, length, profile["min_fluff_length"])
+        keep &= test(lt, c[profile["exclude"]], 1)
+        if profile["skip_topic_lists"]:
+            keep &= test(lt, c["topic_list"], 1)
+        min_letters = map(mul, length, repeat(profile["min_alpha"]))
+        keep &= int.from_bytes(bytes(map(ge, c["letters"], min_letters)), "big")
+        keep &= test(ge, c["sentences"], profile["min_sentences"]) | test(gt, length, profile["long_length"])
+        return keep.to_bytes(len(self), "big")
+
+    def select(self, profile):
+        """Map article index -> kept paragraph indices, capped per article."""
+        keep = self.mask(profile)
+        article = self.columns["article"]
+        selected = {}
+        i = keep.find(1)
+        while i != -1:
+            kept = selected.setdefault(article[i], [])
+            if len(kept) < profile["max_paragraphs"]:
+                kept.append(i)
+            i = keep.find(1, i + 1)
+        return {
+            index: kept
+            for index, kept in selected.items()
+            if len(kept) >= profile["min_paragraphs"]
+            and self.articles[index]["html_length"] >= profile["min_html"]
+        }
+
+    def learnings(self, strategy, profile):
+        module = load_strategy(strategy)
+        learnings = []
+        for index, kept in sorted(self.select(profile).items()):
+            article = self.articles[index]
+            learning = module.create_learning([self.paragraph(i) for i in kept], article["title"])
+            if learning and len(learning["learning"]) > profile["min_learning"]:
+                learnings.append({
+                    "learning": learning["learning"],
+                    "title": learning["title"],
+                    "articleUrl": article["url"],
+                    "date": article["date"],
+                })
+        return learnings
+
+
+def parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected KEY=VALUE, got {pair!r}")
+        overrides[key] = value if key == "exclude" else json.loads(value)
+    return overrides
+
+
+def build(input_path, cache_path=FEATURES_PATH):
+    started = time.perf_counter()
+    cache = FeatureCache.build(iter_articles(input_path))
+    cache.save(cache_path)
+    print(f"Cached features for {len(cache)} paragraphs from {len(cache.articles)} articles "
+          f"in {time.perf_counter() - started:.2f}s -> {cache_path}")
+
+
+def select(strategy, overrides=None, cache_path=FEATURES_PATH, output_path=None):
+    profile = dict(THRESHOLDS[strategy])
+    unknown = set(overrides or {}) - set(profile)
+    if unknown:
+        raise ValueError(f"Unknown thresholds: {', '.join(sorted(unknown))}")
+    profile.update(overrides or {})
+    cache = FeatureCache.load(cache_path)
+    started = time.perf_counter()
+    selected = cache.select(profile)
+    elapsed = time.perf_counter() - started
+    kept = sum(len(v) for v in selected.values())
+    print(f"{strategy}: {len(selected)}/{len(cache.articles)} articles, {kept}/{len(cache)} paragraphs "
+          f"kept in {elapsed * 1000:.1f}ms")
+    if output_path:
+        learnings = cache.learnings(strategy, profile)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(learnings, f, indent=2, ensure_ascii=False)
+        print(f"Saved {len(learnings)} learnings to {output_path}")
+    return selected
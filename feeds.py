@@ -0,0 +1,217 @@
+"""
+RSS, Atom and JSON feeds of the FEED_SIZE most recent learnings.
+
+Each feed item is rendered on a single line (newlines in XML text are
+written as character references), and FEED_STATE_PATH records
+the (page, content hash) of each line in the current feeds: a ring of the
+newest FEED_SIZE learnings. When learnings are added, the feeds are patched
+from the lines already on disk: items still in the ring are copied as they
+are, only new or edited ones are rendered, and the oldest fall off the end.
+A run that adds nothing leaves the files (and their HTTP validators)
+untouched. Every feed also gets a gzip twin (feed.xml.gz, ...) for servers
+that serve precompressed files.
+"""
+
+import gzip
+import json
+import os
+from email.utils import format_datetime
+from html import escape
+
+from build_graph import content_hash, write_if_changed
+from dates import normalize_date, parse_date
+
+
+FEED_SIZE = 20
+FEED_STATE_PATH = "feed-state.json"
+SITE_URL = os.environ.get("SITE_URL", "https://krishna-lohia.github.io/daily-learnings").rstrip("/")
+SITE_TITLE = "Today I Learned"
+SITE_DESCRIPTION = "Daily insights on finance, business & economics"
+# Bump when item markup changes, so no item is copied from an older feed.
+FEED_VERSION = "2"
+
+
+def escape_line(text):
+    # XML text with its line breaks as character references, so an item
+    # stays on one line and read_items can copy it whole.
+    return escape(text).replace("\r", "&#13;").replace("\n", "&#10;")
+
+
+def content_html(learning):
+    paragraphs = [p for p in learning.learning.split("\n\n") if p.strip()]
+    html = "".join(f"<p>{escape(p)}</p>" for p in paragraphs)
+    if learning.article_url:
+        html += f'<p><a href="{escape(learning.article_url)}">Read the full article</a></p>'
+    return html
+
+
+class Feed:
+    path = ""
+    item_prefix = ""
+    separator = "\n"
+
+    def head(self, updated):
+        raise NotImplementedError
+
+    def tail(self):
+        raise NotImplementedError
+
+    def item(self, learning, url):
+        raise NotImplementedError
+
+    def render(self, updated, items):
+        return self.head(updated) + self.separator.join(items) + ("\n" if items else "") + self.tail()
+
+    def read_items(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return None
+        return [line.removesuffix(",") for line in lines if line.startswith(self.item_prefix)]
+
+
+class RssFeed(Feed):
+    path = "feed.xml"
+    item_prefix = "    <item>"
+
+    def head(self, updated):
+        date = parse_date(updated)
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n'
+            "  <channel>\n"
+            f"    <title>{escape(SITE_TITLE)}</title>\n"
+            f"    <link>{SITE_URL}/</link>\n"
+            f"    <description>{escape(SITE_DESCRIPTION)}</description>\n"
+            f'    <atom:link href="{SITE_URL}/{self.path}" rel="self" type="application/rss+xml"/>\n'
+            + (f"    <lastBuildDate>{format_datetime(date)}</lastBuildDate>\n" if date else "")
+        )
+
+    def tail(self):
+        return "  </channel>\n</rss>\n"
+
+    def item(self, learning, url):
+        date = parse_date(learning.date)
+        pub_date = f"<pubDate>{format_datetime(date)}</pubDate>" if date else ""
+        return (
+            f"{self.item_prefix}<title>{escape_line(learning.title or 'Untitled')}</title>"
+            f"<link>{escape(url)}</link><guid isPermaLink=\"true\">{escape(url)}</guid>{pub_date}"
+            f"<description>{escape_line(content_html(learning))}</description></item>"
+        )
+
+
+class AtomFeed(Feed):
+    path = "atom.xml"
+    item_prefix = "  <entry>"
+
+    def head(self, updated):
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+            f"  <title>{escape(SITE_TITLE)}</title>\n"
+            f"  <subtitle>{escape(SITE_DESCRIPTION)}</subtitle>\n"
+            f'  <link href="{SITE_URL}/"/>\n'
+            f'  <link href="{SITE_URL}/{self.path}" rel="self"/>\n'
+            f"  <id>{SITE_URL}/</id>\n"
+            f"  <updated>{normalize_date(updated) or '1970-01-01T00:00:00Z'}</updated>\n"
+            f"  <author><name>{escape(SITE_TITLE)}</name></author>\n"
+        )
+
+    def tail(self):
+        return "</feed>\n"
+
+    def item(self, learning, url):
+        date = normalize_date(learning.date) or "1970-01-01T00:00:00Z"
+        return (
+            f"{self.item_prefix}<title>{escape_line(learning.title or 'Untitled')}</title>"
+            f'<link href="{escape(url)}"/><id>{escape(url)}</id>'
+            f"<published>{date}</published><updated>{date}</updated>"
+            f'<content type="html">{escape_line(content_html(learning))}</content></entry>'
+        )
+
+
+class JsonFeed(Feed):
+    path = "feed.json"
+    item_prefix = '    {"id":'
+    separator = ",\n"
+
+    def head(self, updated):
+        header = json.dumps({
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": SITE_TITLE,
+            "description": SITE_DESCRIPTION,
+            "home_page_url": f"{SITE_URL}/",
+            "feed_url": f"{SITE_URL}/{self.path}",
+        }, ensure_ascii=False, indent=2)
+        return header[:-2] + ',\n  "items": [\n'
+
+    def tail(self):
+        return "  ]\n}\n"
+
+    def item(self, learning, url):
+        item = {
+            "id": url,
+            "url": url,
+            "title": learning.title or "Untitled",
+            "content_html": content_html(learning),
+        }
+        if learning.article_url:
+            item["external_url"] = learning.article_url
+        date = normalize_date(learning.date)
+        if date:
+            item["date_published"] = date
+        return "    " + json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+
+FEEDS = (RssFeed(), AtomFeed(), JsonFeed())
+
+
+def load_ring(path=FEED_STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [tuple(entry) for entry in json.load(f)]
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+
+
+def write_feed(path, content):
+    data = content.encode("utf-8")
+    written = []
+    if write_if_changed(path, data):
+        written.append(path)
+    # mtime=0 keeps the compressed bytes identical for identical feeds.
+    if write_if_changed(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0)):
+        written.append(f"{path}.gz")
+    return written
+
+
+def item_hash(learning):
+    # Only what the feeds show: related-list updates don't re-render items.
+    return content_hash([FEED_VERSION, learning.title, learning.date, learning.article_url, learning.learning])
+
+
+def publish_feeds(learnings, pages, feeds=FEEDS):
+    """Patch every feed to the newest FEED_SIZE learnings; returns written paths.
+
+    ``pages`` holds the site-relative page path of each of those learnings.
+    """
+    recent = learnings[:FEED_SIZE]
+    ring = [(page, item_hash(learning)) for page, learning in zip(pages, recent)]
+    previous = load_ring()
+    if previous == ring and all(os.path.exists(feed.path) for feed in feeds):
+        return []
+
+    updated = recent[0].date if recent else ""
+    written = []
+    for feed in feeds:
+        lines = feed.read_items() if previous is not None else None
+        cached = dict(zip(previous, lines)) if lines is not None and len(lines) == len(previous) else {}
+        items = [
+            cached.get(entry) or feed.item(learning, f"{SITE_URL}/{entry[0]}")
+            for entry, learning in zip(ring, recent)
+        ]
+        written += write_feed(feed.path, feed.render(updated, items))
+    if write_if_changed(FEED_STATE_PATH, json.dumps([list(entry) for entry in ring]) + "\n"):
+        written.append(FEED_STATE_PATH)
+    return written
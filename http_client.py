@@ -0,0 +1,205 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36",
+    "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# A short per-attempt timeout plus retries recovers from a blip far sooner
+# than a single 30s wait, and an open breaker fails the rest of a run fast.
+TIMEOUT = 10
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60.0
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Stops calling a host after repeated failures.
+
+    After ``threshold`` consecutive failures the breaker opens and every call
+    fails immediately. Once ``cooldown`` seconds pass, one trial call is let
+    through; success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(url):
+    host = urlsplit(url).netloc.lower()
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+class RateLimiter:
+    """Token bucket: ``rate`` requests per second, bursts of up to ``burst``.
+
+    Callers reserve a token under the lock and sleep outside it, so threads
+    waiting on one host never hold up another host's limiter.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_limiters = {}
+
+
+def set_rate_limit(url, rate, burst=1):
+    """Limit requests to the host of ``url``; a rate of 0 removes the limit."""
+    host = urlsplit(url).netloc.lower()
+    with _breakers_lock:
+        if rate:
+            _limiters[host] = RateLimiter(rate, burst)
+        else:
+            _limiters.pop(host, None)
+
+
+def limiter_for(url):
+    return _limiters.get(urlsplit(url).netloc.lower())
+
+
+def is_retryable(error):
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in RETRY_STATUSES
+    return isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt, error=None):
+    retry_after = getattr(error, "headers", None) and error.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(BACKOFF_CAP, float(retry_after))
+    # "Full jitter": spreads retries from parallel callers apart.
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class Validators:
+    """ETag and Last-Modified from the last response for one URL.
+
+    Passed to fetch(), they turn the request into a conditional one, and are
+    updated from every full response.
+    """
+
+    def __init__(self):
+        self.etag = None
+        self.last_modified = None
+
+    def headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update(self, headers):
+        self.etag = headers.get("ETag") or self.etag
+        self.last_modified = headers.get("Last-Modified") or self.last_modified
+
+
+def fetch(url, timeout=TIMEOUT, retries=RETRIES, max_bytes=None, validators=None):
+    """GET ``url`` as text. With ``validators``, returns None on 304 Not Modified."""
+    breaker = breaker_for(url)
+    limiter = limiter_for(url)
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+        if limiter:
+            limiter.acquire()
+        headers = {**HEADERS, **validators.headers()} if validators else HEADERS
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                # Reading one byte past the cap tells a full-size body from an oversized one.
+                data = response.read(max_bytes + 1) if max_bytes else response.read()
+                if max_bytes and len(data) > max_bytes:
+                    raise ResponseTooLarge(f"response over {max_bytes} bytes")
+                body = data.decode("utf-8", errors="ignore")
+                if validators:
+                    validators.update(response.headers)
+        except Exception as error:
+            if validators and isinstance(error, urllib.error.HTTPError) and error.code == 304:
+                breaker.record_success()
+                return None
+            if not is_retryable(error):
+                # The host answered; a 404 says nothing about its health.
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt == retries:
+                raise
+            time.sleep(backoff_delay(attempt, error))
+            continue
+        breaker.record_success()
+        return body
+
+
+def fetch_json(url, timeout=TIMEOUT, retries=RETRIES):
+    return json.loads(fetch(url, timeout=timeout, retries=retries))
@@ -0,0 +1,212 @@
+"""
+Bounds on what one article may cost the pipeline.
+
+Pages over MAX_HTML_BYTES are refused while downloading. Parsing runs in a
+small pool of worker processes: <script> and <style> bodies are cut out
+first, and a parse that outlives EXTRACT_TIMEOUT seconds (or runs a worker
+out of its EXTRACT_MEMORY_MB address space) has its worker killed and
+replaced. Whichever limit an article hits, it is appended to QUARANTINE_PATH
+with the reason and skipped by later runs instead of being retried, so one
+pathological page costs a run at most one timeout. A worker that cannot
+start is the host's problem, not the article's: that raises ParseUnavailable,
+which callers queue for retry like a network error.
+
+EXTRACT_TIMEOUT=0 parses in-process with only the byte cap, for debugging
+and profiling.
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+
+from dates import utc_now
+from extraction import extract_blocks
+from http_client import ResponseTooLarge, fetch
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+MAX_HTML_BYTES = int(os.environ.get("MAX_HTML_BYTES", 5_000_000))
+EXTRACT_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", 10))
+EXTRACT_MEMORY_MB = int(os.environ.get("EXTRACT_MEMORY_MB", 1024))
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+QUARANTINE_PATH = os.environ.get("QUARANTINE_PATH", "quarantine.jsonl")
+
+# Inlined scripts and styles can be most of a page and never hold content.
+# Unclosed tags are left for the parser, which skips them anyway.
+STRIP_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", flags=re.I | re.S)
+
+
+class ArticleRejected(Exception):
+    pass
+
+
+class ParseUnavailable(Exception):
+    pass
+
+
+def parse(html, containers):
+    return extract_blocks(STRIP_RE.sub("", html), containers)
+
+
+def serve(conn, memory_mb):
+    # Runs in the worker process: parse requests until the pipe closes.
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    conn.send("ready")
+    while True:
+        try:
+            html, containers = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            conn.send((True, parse(html, containers)))
+        except MemoryError:
+            conn.send((False, f"parse exceeded {memory_mb} MB"))
+        except Exception as error:
+            conn.send((False, f"parse failed: {type(error).__name__}: {error}"))
+
+
+class ParseWorker:
+    def __init__(self, context, memory_mb):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+        # Wait out interpreter startup here, so it isn't charged to the
+        # first article's parse timeout.
+        try:
+            self.conn.recv()
+        except EOFError:
+            self.kill()
+            raise ParseUnavailable("parse worker failed to start") from None
+
+    def parse(self, html, containers, timeout):
+        self.conn.send((html, containers))
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise ArticleRejected(f"parse exceeded {timeout:g}s")
+        try:
+            ok, value = self.conn.recv()
+        except EOFError:
+            self.kill()
+            raise ArticleRejected("parse worker died") from None
+        if not ok:
+            raise ArticleRejected(value)
+        return value
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """Up to ``size`` parse workers, started on first use and replaced when killed."""
+
+    def __init__(self, size=EXTRACT_WORKERS, timeout=EXTRACT_TIMEOUT, memory_mb=EXTRACT_MEMORY_MB):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        # Spawned, not forked: callers have threads running.
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = []
+        self.started = 0
+        # Notified whenever a worker is returned or a dead one frees its slot,
+        # so a caller waiting for a worker can never miss a replacement.
+        self.available = threading.Condition()
+
+    def checkout(self):
+        with self.available:
+            while not self.idle and self.started >= self.size:
+                self.available.wait()
+            if self.idle:
+                return self.idle.pop()
+            self.started += 1
+        try:
+            return ParseWorker(self.context, self.memory_mb)
+        except BaseException:
+            self.release(None)
+            raise
+
+    def release(self, worker):
+        with self.available:
+            if worker is not None and worker.alive():
+                self.idle.append(worker)
+            else:
+                self.started -= 1
+            self.available.notify()
+
+    def parse(self, html, containers):
+        if not self.timeout:
+            return parse(html, containers)
+        worker = self.checkout()
+        try:
+            return worker.parse(html, containers, self.timeout)
+        finally:
+            self.release(worker)
+
+
+class Quarantine:
+    """Articles that broke a budget, one JSON object per line."""
+
+    def __init__(self, path=QUARANTINE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def urls(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {json.loads(line)["url"] for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def add(self, url, reason, **details):
+        entry = {"url": url, "reason": reason, "quarantined": utc_now(), **details}
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"Quarantined {url}: {reason}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+quarantine = Quarantine()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+
+def fetch_article(url, source):
+    """Download ``url`` and parse it within the budgets; returns (html, blocks).
+
+    An article over budget is quarantined and comes back with no HTML and
+    no blocks, like an empty page. Network errors and ParseUnavailable are
+    raised as usual, for the caller's FailedQueue.
+    """
+    try:
+        html = fetch(url, max_bytes=MAX_HTML_BYTES)
+    except ResponseTooLarge as error:
+        quarantine.add(url, str(error))
+        return "", []
+    started = time.perf_counter()
+    try:
+        blocks = get_pool().parse(html, source.containers)
+    except ArticleRejected as error:
+        quarantine.add(url, str(error), bytes=len(html), seconds=round(time.perf_counter() - started, 2))
+        return "", []
+    return html, blocks
@@ -0,0 +1,199 @@
+"""
+Offline and repeat-visit caching: a service worker plus the manifest it
+follows.
+
+PRECACHE_PATH lists the SHA-1 of every file the worker serves from its
+cache. "assets" is the site shell (style.css, index.html, archive.html,
+deltas/manifest.json and topics.json), which the worker downloads when it
+installs. "pages" is the learning/ pages, which it caches as they are
+visited. The blob/ shards are left to the network: the current month's
+change with every publish, and returning visitors keep the corpus in
+IndexedDB and top it up from deltas/ instead.
+
+Page loads are answered from the cache straight away, and the manifest is
+revalidated in the background. When its version moves on, the worker
+downloads only the shell assets whose hash changed and drops the pages
+whose hash changed. A cached index.html can therefore be one publish behind
+the blob; it notices from blob/index.json and shifts its position.
+
+The manifest is regenerated incrementally: the shell is rehashed each run,
+since style.css is edited by hand, but a page's hash is carried over unless
+the publish rewrote it.
+"""
+
+import json
+
+from build_graph import content_hash, write_if_changed
+from deltas import MANIFEST_PATH as DELTAS_MANIFEST_PATH
+from topics import TOPICS_PATH
+
+
+PRECACHE_PATH = "precache-manifest.json"
+SW_PATH = "sw.js"
+SHELL = ("index.html", "archive.html", "style.css", DELTAS_MANIFEST_PATH, TOPICS_PATH)
+# Bump when the worker changes how it stores entries, so old caches are dropped.
+CACHE_NAME = "daily-learnings-precache-v2"
+
+SW_SOURCE = r"""
+const SCOPE = self.registration.scope;
+
+function urlFor(path) {
+    return new URL(path, SCOPE).href;
+}
+
+async function sha1(buffer) {
+    const digest = await crypto.subtle.digest('SHA-1', buffer);
+    return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+async function storedManifest(cache) {
+    const response = await cache.match(urlFor(MANIFEST_PATH));
+    return response ? response.json() : { version: null, assets: {}, pages: {} };
+}
+
+// Fetch a file and check it against the manifest, since a CDN may still
+// serve the previous copy for a while after a publish.
+async function fetchVerified(path, hash) {
+    const response = await fetch(urlFor(path), { cache: 'no-cache' });
+    if (!response.ok || response.redirected) {
+        throw new Error(`Could not fetch ${path}: ${response.status}`);
+    }
+    if (await sha1(await response.clone().arrayBuffer()) !== hash) {
+        throw new Error(`${path} does not match the manifest yet`);
+    }
+    return response;
+}
+
+async function update() {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await fetch(urlFor(MANIFEST_PATH), { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`Could not fetch the manifest: ${response.status}`);
+    }
+    const manifest = await response.json();
+    const stored = await storedManifest(cache);
+    if (manifest.version === stored.version) return;
+
+    // All changed shell files or none, so index.html and the deltas
+    // manifest always come from the same publish.
+    const changed = Object.entries(manifest.assets).filter(([path, hash]) => stored.assets[path] !== hash);
+    const fresh = await Promise.all(changed.map(([path, hash]) => fetchVerified(path, hash)));
+    await Promise.all(fresh.map((file, i) => cache.put(urlFor(changed[i][0]), file)));
+
+    const stale = [
+        ...Object.keys(stored.assets).filter((path) => !(path in manifest.assets)),
+        ...Object.keys(stored.pages).filter((path) => stored.pages[path] !== manifest.pages[path]),
+    ];
+    await Promise.all(stale.map((path) => cache.delete(urlFor(path))));
+    await cache.put(urlFor(MANIFEST_PATH), new Response(JSON.stringify(manifest), {
+        headers: { 'Content-Type': 'application/json' },
+    }));
+}
+
+let updating = null;
+
+function refresh() {
+    if (!updating) {
+        updating = update().catch((error) => console.warn('Precache update failed:', error)).finally(() => {
+            updating = null;
+        });
+    }
+    return updating;
+}
+
+async function respond(request, path) {
+    const cache = await caches.open(CACHE_NAME);
+    const manifest = await storedManifest(cache);
+    if (!(path in manifest.assets) && !(path in manifest.pages)) {
+        return fetch(request);
+    }
+    const cached = await cache.match(urlFor(path));
+    if (cached) return cached;
+    if (path in manifest.pages) {
+        try {
+            const response = await fetchVerified(path, manifest.pages[path]);
+            await cache.put(urlFor(path), response.clone());
+            return response;
+        } catch (error) {
+            // Not published yet, or served stale: don't keep it.
+        }
+    }
+    return fetch(request);
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(update().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name.startsWith('daily-learnings-') && name !== CACHE_NAME) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(SCOPE)) return;
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    let path = url.href.slice(SCOPE.length);
+    if (path === '' || path.endsWith('/')) path += 'index.html';
+    if (path === MANIFEST_PATH) return;
+    event.respondWith(respond(request, path));
+    if (request.mode === 'navigate') {
+        // Answer from the cache now; a newer publish is picked up for next time.
+        event.waitUntil(refresh());
+    }
+});
+"""
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+def load_manifest(path=PRECACHE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest.get("assets", {}), manifest.get("pages", {})
+    except (FileNotFoundError, ValueError, AttributeError):
+        return {}, {}
+
+
+def render_worker():
+    config = (
+        f"const CACHE_NAME = {json.dumps(CACHE_NAME)};\n"
+        f"const MANIFEST_PATH = {json.dumps(PRECACHE_PATH)};\n"
+    )
+    return f"// Generated by precache.py: edit SW_SOURCE there, not this file.\n{config}{SW_SOURCE}"
+
+
+def publish_precache(pages, written):
+    """Refresh the worker and its manifest after a publish; returns written paths.
+
+    ``pages`` is every learning page, and ``written`` what the publish rewrote.
+    """
+    _, previous_pages = load_manifest()
+    rewritten = set(written)
+    assets = {path: file_hash(path) for path in SHELL}
+    pages = {
+        page: previous_pages[page] if page in previous_pages and page not in rewritten else file_hash(page)
+        for page in pages
+    }
+    manifest = {
+        "version": content_hash([assets, pages])[:12],
+        "assets": assets,
+        "pages": pages,
+    }
+    written = []
+    if write_if_changed(PRECACHE_PATH, json.dumps(manifest, indent=1, sort_keys=True) + "\n"):
+        written.append(PRECACHE_PATH)
+    if write_if_changed(SW_PATH, render_worker()):
+        written.append(SW_PATH)
+    return written
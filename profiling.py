@@ -0,0 +1,129 @@
+"""
+Profile a pipeline run and report where the time goes.
+
+    python3 dailylearnings.py --profile bench extract
+    python3 dailylearnings.py --profile profile.folded --profile-top 30 backfill
+
+The run executes under cProfile (main thread only) while a sampling thread
+records every thread's stack every few milliseconds, so crawl workers show up
+in the samples too. Samples are written as collapsed
+stacks ("frame;frame;frame count"), ready for flamegraph.pl or speedscope.
+The report lists the top functions by cumulative time and the share of
+samples spent in each pipeline stage.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+
+SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP = 20
+
+# Innermost matching frame wins, so a parse inside a fetch loop counts as parse.
+STAGES = [
+    ("parse", ("extraction", "extract-", "parse_guard", "html/parser", "_markupbase", "html/__init__")),
+    ("fetch", ("http_client", "archive_pager", "urllib/", "http/client", "socket", "ssl")),
+    ("store", ("store", "records", "json/", "corpus", "failures")),
+    ("publish", ("publish", "build_graph")),
+]
+
+
+def stage_for(filename):
+    path = filename.replace(os.sep, "/")
+    name = path.rsplit("/", 1)[-1]
+    for stage, markers in STAGES:
+        for marker in markers:
+            if marker in path if "/" in marker else name.startswith(marker):
+                return stage
+    return None
+
+
+def frame_label(code):
+    name = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples every thread's stack on a timer into collapsed-stack counts."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.stages = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    self.sample(frame)
+
+    def sample(self, frame):
+        labels = []
+        stage = None
+        # Frames above run_profiled() are the CLI wrapper, not the run.
+        while frame is not None and frame.f_code is not run_profiled.__code__:
+            code = frame.f_code
+            labels.append(frame_label(code))
+            if stage is None:
+                stage = stage_for(code.co_filename)
+            frame = frame.f_back
+        self.stacks[";".join(reversed(labels))] += 1
+        self.stages[stage or "other"] += 1
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def report(profiler, sampler, top, elapsed, out=sys.stderr):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append((cumtime, tottime, calls, name, filename, line))
+    rows.sort(reverse=True)
+
+    print(f"\nProfile: {elapsed:.2f}s wall, {sum(sampler.stacks.values())} samples", file=out)
+    print(f"{'cumtime':>9} {'tottime':>9} {'calls':>9}  {'stage':<8} function", file=out)
+    for cumtime, tottime, calls, name, filename, line in rows[:top]:
+        where = os.path.basename(filename) if filename != "~" else "builtin"
+        stage = stage_for(filename) or "-"
+        print(f"{cumtime:>9.3f} {tottime:>9.3f} {calls:>9}  {stage:<8} {name} ({where}:{line})", file=out)
+
+    total = sum(sampler.stages.values())
+    if total:
+        print("\nStage share of samples:", file=out)
+        for stage, count in sampler.stages.most_common():
+            print(f"  {stage:<8} {count / total:>6.1%}", file=out)
+
+
+def run_profiled(func, path="profile.folded", top=DEFAULT_TOP):
+    sampler = StackSampler()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+        sampler.write(path)
+        report(profiler, sampler, top, elapsed)
+        print(f"Collapsed stacks written to {path}", file=sys.stderr)
@@ -0,0 +1,307 @@
+import re
+from html import escape
+
+from blob import build_blob, render_shards, shard_paths, shards_path, split_shards
+from build_graph import BuildGraph, content_hash
+from dates import parse_date
+from deltas import publish_deltas
+from feeds import FEED_SIZE, publish_feeds
+from precache import publish_precache
+from records import Learning
+from store import load_learnings, save_learnings
+from topics import publish_topics
+
+
+INDEX_PATH = "index.html"
+ARCHIVE_PATH = "archive.html"
+PAGES_DIR = "learning"
+
+# Bump when the rendered markup changes so every output is rebuilt once.
+RENDER_VERSION = "4"
+
+PRERENDER_START = "<!-- prerender:{name}:start -->"
+PRERENDER_END = "<!-- prerender:{name}:end -->"
+
+
+def slug_for(learning):
+    slug = learning.slug.rstrip("/")
+    if not slug:
+        slug = learning.title or "untitled"
+    # Other sources can reuse a post slug, so theirs carry the source name.
+    # Learnings from the default source have no "source" key.
+    source = learning.get("source")
+    if source:
+        slug = f"{source}-{slug}"
+    slug = re.sub(r"[^a-z0-9]+", "-", slug.lower()).strip("-")
+    return slug or "untitled"
+
+
+def page_path(learning):
+    return f"{PAGES_DIR}/{slug_for(learning)}.html"
+
+
+def format_date(value):
+    date = parse_date(value)
+    if not date:
+        return ""
+    return f"{date:%B} {date.day}, {date.year}"
+
+
+def replace_region(document, name, content):
+    start = PRERENDER_START.format(name=name)
+    end = PRERENDER_END.format(name=name)
+    head, found, rest = document.partition(start)
+    if not found:
+        raise ValueError(f"Missing prerender region {name!r}")
+    _, found, tail = rest.partition(end)
+    if not found:
+        raise ValueError(f"Unterminated prerender region {name!r}")
+    return f"{head}{start}\n{content}{end}{tail}"
+
+
+def nav_link(direction, href):
+    label = "Previous" if direction == "prev" else "Next"
+    path = "M15 18l-6-6 6-6" if direction == "prev" else "M9 18l6-6-6-6"
+    icon = (
+        '<svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">'
+        f'<path d="{path}"/></svg>'
+    )
+    inner = f"{icon}<span>{label}</span>" if direction == "prev" else f"<span>{label}</span>{icon}"
+    if href:
+        return f'<a class="nav-btn nav-btn-{direction}" href="{escape(href)}">{inner}</a>'
+    return f'<a class="nav-btn nav-btn-{direction}" aria-disabled="true">{inner}</a>'
+
+
+def render_header(learning, position, total):
+    title = escape(learning.title or "Today's Insight")
+    date = escape(format_date(learning.date))
+    content = escape(learning.learning)
+    counter = f"{position} of {total}" if position and total else ""
+    return (
+        '            <div class="learning-header">\n'
+        f'                <h2 class="learning-title" id="learning-title">{title}</h2>\n'
+        '                <div class="learning-meta">\n'
+        f'                    <span class="learning-date" id="learning-date">{date}</span>\n'
+        f'                    <span class="learning-counter" id="learning-counter" data-total="{total}">{counter}</span>\n'
+        '                </div>\n'
+        '            </div>\n'
+        '\n'
+        f'            <div class="learning-content" id="learning-content">{content}</div>\n'
+    )
+
+
+def render_source_link(learning):
+    url = learning.article_url
+    hidden = "" if url else ' style="display: none"'
+    return (
+        f'<a href="{escape(url or "#")}" class="source-link" id="article-link" target="_blank" rel="noopener noreferrer"{hidden}>\n'
+        '                    Read full article\n'
+        '                </a>'
+    )
+
+
+def render_related(related):
+    if not related:
+        return ""
+    items = "".join(
+        f'                <li><a href="{escape(slug_for(item))}.html">{escape(item.title or "Untitled")}</a></li>\n'
+        for item in related
+    )
+    return (
+        '\n        <section class="related">\n'
+        '            <h2 class="related-title">Related learnings</h2>\n'
+        '            <ul class="related-list">\n'
+        f'{items}'
+        '            </ul>\n'
+        '        </section>\n'
+    )
+
+
+def render_page(learning, prev_learning, next_learning, related=()):
+    title = escape(learning.title or "Today's Insight")
+    description = escape(learning.learning[:160])
+    prev_href = f"{slug_for(prev_learning)}.html" if prev_learning else ""
+    next_href = f"{slug_for(next_learning)}.html" if next_learning else ""
+    # Pages carry no "N of M" counter: it would change on every page each
+    # time a learning is added.
+    header = render_header(learning, 0, 0)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} — Today I Learned</title>
+    <meta name="description" content="{description}">
+    <link rel="stylesheet" href="../style.css">
+</head>
+<body>
+    <main class="container">
+        <header class="header">
+            <div class="header-content">
+                <p class="eyebrow">Daily insights on finance, business & economics</p>
+                <h1 class="title"><a class="title-link" href="../index.html">Today I Learned</a></h1>
+            </div>
+        </header>
+
+        <section class="learning-card">
+{header}
+            <div class="learning-actions">
+                {nav_link("prev", prev_href)}
+
+                {render_source_link(learning)}
+
+                {nav_link("next", next_href)}
+            </div>
+        </section>
+{render_related(related)}
+        <footer class="footer">
+            <p><a href="../archive.html">All learnings</a> · Content sourced from <a href="https://thedailybrief.zerodha.com" target="_blank" rel="noopener noreferrer">The Daily Brief by Zerodha</a></p>
+        </footer>
+    </main>
+    <script>
+        if ('serviceWorker' in navigator) {{
+            navigator.serviceWorker.register('../sw.js').catch(() => {{}});
+        }}
+    </script>
+</body>
+</html>
+"""
+
+
+def render_archive_items(learnings):
+    items = []
+    for learning in learnings:
+        title = escape(learning.title or "Untitled")
+        date = escape(format_date(learning.date))
+        url = escape(learning.article_url or "#")
+        items.append(
+            '                <article class="archive-item">\n'
+            f'                    <div class="archive-meta">{date}</div>\n'
+            f'                    <h2 class="archive-title"><a href="{escape(page_path(learning))}">{title}</a></h2>\n'
+            f'                    <a class="article-link" href="{url}" target="_blank" rel="noopener noreferrer">Read the source</a>\n'
+            '                </article>\n'
+        )
+    if not items:
+        return '                <p class="archive-empty">No learnings yet.</p>\n'
+    return "".join(items)
+
+
+def neighbour_key(learning):
+    return slug_for(learning) if learning else ""
+
+
+def publish_pages(graph, learnings, hashes):
+    total = len(learnings)
+    by_slug = {slug_for(learning): learning for learning in learnings}
+    for i, learning in enumerate(learnings):
+        prev_learning = learnings[i - 1] if i > 0 else None
+        next_learning = learnings[i + 1] if i + 1 < total else None
+        related = [by_slug[slug] for slug in learning.get("related") or () if slug in by_slug]
+        deps = [
+            RENDER_VERSION, hashes[i], neighbour_key(prev_learning), neighbour_key(next_learning),
+            content_hash([item.title for item in related]),
+        ]
+        graph.build(
+            page_path(learning),
+            deps,
+            lambda: render_page(learning, prev_learning, next_learning, related),
+        )
+
+
+def render_index(learnings):
+    with open(INDEX_PATH, "r", encoding="utf-8") as f:
+        document = f.read()
+    if learnings:
+        learning = learnings[0]
+    else:
+        learning = Learning(title="No learnings available yet", learning="Check back soon for new insights.")
+    document = replace_region(document, "learning", render_header(learning, 1, len(learnings)) + "            ")
+    document = replace_region(document, "source", "                " + render_source_link(learning) + "\n                ")
+    return document
+
+
+def render_topic_filters(facets, total):
+    if not facets:
+        return ""
+    buttons = [("", "All", total)] + [(facet["tag"], facet["label"], facet["count"]) for facet in facets]
+    return "".join(
+        f'                <button type="button" class="topic-filter" data-topic="{escape(tag)}" '
+        f'aria-pressed="{"false" if tag else "true"}">{escape(label)} '
+        f'<span class="topic-count">{count}</span></button>\n'
+        for tag, label, count in buttons
+    )
+
+
+def render_archive(learnings, facets):
+    with open(ARCHIVE_PATH, "r", encoding="utf-8") as f:
+        document = f.read()
+    document = replace_region(document, "topics", render_topic_filters(facets, len(learnings)) + "            ")
+    return replace_region(document, "archive", render_archive_items(learnings) + "            ")
+
+
+def publish_index(graph, learnings, hashes):
+    deps = [RENDER_VERSION, str(len(learnings))] + hashes[:1]
+    graph.build(INDEX_PATH, deps, lambda: render_index(learnings))
+
+
+def publish_archive(graph, learnings, facets):
+    # The listing only shows title, date and link, so body edits don't touch
+    # it unless they change a topic count.
+    deps = [RENDER_VERSION, content_hash([(f["tag"], f["count"]) for f in facets])] + [
+        content_hash([l.title, l.date, l.article_url]) for l in learnings
+    ]
+    graph.build(ARCHIVE_PATH, deps, lambda: render_archive(learnings, facets))
+
+
+def publish_blob(graph, learnings, hashes):
+    # One shard per month, like the store: adding a learning rebuilds the
+    # current month's pair and the shard list, and nothing else.
+    shards = split_shards(learnings)
+    start = 0
+    for key, count in shards:
+        part = learnings[start:start + count]
+        deps = [RENDER_VERSION] + hashes[start:start + count]
+        start += count
+        # The blob and its index are always rebuilt together, so one render
+        # serves both outputs.
+        built = []
+
+        def render(i, part=part, built=built):
+            if not built:
+                built.extend(build_blob(part))
+            return built[i]
+
+        path, index_path = shard_paths(key)
+        graph.build(path, deps, lambda render=render: render(0))
+        graph.build(index_path, deps, lambda render=render: render(1))
+    graph.build(shards_path(), [render_shards(shards)], lambda: render_shards(shards))
+
+
+def publish(learnings):
+    graph = BuildGraph()
+    hashes = [content_hash(learning.to_dict()) for learning in learnings]
+    publish_pages(graph, learnings, hashes)
+    publish_index(graph, learnings, hashes)
+    facets, written = publish_topics(graph, learnings, hashes)
+    publish_archive(graph, learnings, facets)
+    publish_blob(graph, learnings, hashes)
+    written = graph.finish() + written
+    written += publish_deltas(learnings, hashes, [slug_for(learning) for learning in learnings])
+    written += publish_feeds(learnings, [page_path(learning) for learning in learnings[:FEED_SIZE]])
+    # Last, so the manifest hashes what this run wrote.
+    written += publish_precache([page_path(learning) for learning in learnings], written)
+    print(f"Published {len(written)} changed files ({graph.skipped} up to date).")
+    return written
+
+
+def main():
+    from related import update_related
+
+    learnings = load_learnings()
+    if update_related(learnings):
+        save_learnings(learnings)
+    publish(learnings)
+
+
+if __name__ == "__main__":
+    main()
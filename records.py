@@ -0,0 +1,174 @@
+import codecs
+import json
+import sys
+import threading
+
+
+# Known URL prefixes are shared by every learning from the same site; interning
+# them (and the dates) keeps one copy per distinct value instead of one per record.
+def split_url(url):
+    head, sep, slug = (url or "").rpartition("/")
+    if not sep:
+        return "", sys.intern(slug)
+    return sys.intern(head + sep), slug
+
+
+class BodySource:
+    """Reads learning bodies back out of a store file on demand.
+
+    The file handle stays open, so bodies remain readable after the store
+    has been atomically replaced by save_learnings(). Close it (or use it as
+    a context manager) once its records are done with.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.lock = threading.Lock()
+
+    def read(self, offset, length):
+        with self.lock:
+            self.file.seek(offset)
+            data = self.file.read(length)
+        return json.loads(data).get("learning") or ""
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Learning:
+    __slots__ = ("title", "date", "url_prefix", "slug", "extra", "_body", "_source", "_offset", "_length")
+
+    def __init__(self, learning="", article_url="", title="", date="", **extra):
+        self.title = title or ""
+        self.date = sys.intern(date or "")
+        self.url_prefix, self.slug = split_url(article_url)
+        self.extra = extra or None
+        self._body = learning or ""
+        self._source = None
+        self._offset = 0
+        self._length = 0
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["article_url"] = data.pop("articleUrl", "")
+        return cls(**data)
+
+    @classmethod
+    def lazy(cls, data, source, offset, length):
+        data = dict(data)
+        data.pop("learning", None)
+        record = cls.from_dict(data)
+        record._body = None
+        record._source = source
+        record._offset = offset
+        record._length = length
+        return record
+
+    @property
+    def learning(self):
+        # A lazy body is read on first use and kept: a publish reads it
+        # several times (hash, page, feeds, related). Records never read stay
+        # small.
+        if self._body is None:
+            self._body = self._source.read(self._offset, self._length)
+            self._source = None
+        return self._body
+
+    @learning.setter
+    def learning(self, value):
+        self._body = value or ""
+        self._source = None
+
+    @property
+    def article_url(self):
+        return self.url_prefix + self.slug
+
+    @article_url.setter
+    def article_url(self, value):
+        self.url_prefix, self.slug = split_url(value)
+
+    def get(self, key, default=None):
+        return (self.extra or {}).get(key, default)
+
+    def set(self, key, value):
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def to_dict(self):
+        data = {
+            "learning": self.learning,
+            "title": self.title,
+            "articleUrl": self.article_url,
+            "date": self.date,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        return isinstance(other, Learning) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Learning({self.article_url!r}, date={self.date!r})"
+
+
+def iter_spans(path, chunk_size=1 << 20):
+    """Yield (object, byte offset, byte length) for each element of a JSON array file.
+
+    The file is decoded a chunk at a time, so only one chunk (plus the
+    element being parsed) is ever held as text.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        buf = ""
+        pos = 0
+        offset = 0
+        eof = False
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,[":
+                pos += 1
+                offset += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            if pos < len(buf):
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    size = len(buf[pos:end].encode("utf-8"))
+                    yield obj, offset, size
+                    offset += size
+                    pos = end
+                    continue
+            elif eof:
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + utf8.decode(chunk, final=eof)
+            pos = 0
+
+
+def load_records(path, lazy=True):
+    if not lazy:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [Learning.from_dict(item) for item in data if isinstance(item, dict)]
+
+    source = BodySource(path)
+    return [
+        Learning.lazy(item, source, offset, size)
+        for item, offset, size in iter_spans(path)
+        if isinstance(item, dict)
+    ]
@@ -0,0 +1,176 @@
+"""
+Related learnings: for each learning, the TOP_K most similar others by
+TF-IDF cosine, stored as page slugs under the record's "related" key.
+
+Vectors are sparse dicts cut to their MAX_TERMS strongest terms, and the
+inverted index keeps only the MAX_POSTINGS strongest entries per term, so
+scoring one learning costs at most MAX_TERMS * MAX_POSTINGS multiply-adds no
+matter how big the archive gets. Queries are scored a block at a time, with
+each posting list read once per block: a blocked sparse product of the
+query rows against the index.
+
+Updates are incremental. Only learnings without a "related" list (or with a
+neighbour that no longer exists) are scored. Each new learning is then
+offered to the learnings from the same month it scored against, which take
+it if it beats their current weakest neighbour. IDF weights drift as the archive grows;
+`python3 related.py rebuild` recomputes every list.
+"""
+
+import heapq
+import math
+import re
+import sys
+from collections import Counter, defaultdict
+
+
+TOP_K = 5
+MAX_TERMS = 40
+MAX_POSTINGS = 200
+BLOCK_SIZE = 256
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+STOPWORDS = frozenset("""
+    about above after again against also and any are because been before being
+    below between both but can could did does doing down during each few for
+    from further had has have having her here hers him his how into its itself
+    just more most not now off once only other our ours out over own same she
+    should some such than that the their theirs them then there these they
+    this those through too under until very was were what when where which
+    while who whom why will with would you your yours also said says one two
+    three new per cent like get got many much may might must even still
+""".split())
+
+
+def tokenize(text):
+    return [word for word in TOKEN_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def document_text(learning):
+    return f"{learning.title}\n{learning.learning}"
+
+
+def build_vectors(texts):
+    counts = [Counter(tokenize(text)) for text in texts]
+    df = Counter()
+    for count in counts:
+        df.update(count.keys())
+    n = len(counts)
+    vectors = []
+    for count in counts:
+        weights = {
+            term: (1 + math.log(tf)) * math.log(n / df[term])
+            for term, tf in count.items()
+            if df[term] < n
+        }
+        if len(weights) > MAX_TERMS:
+            weights = dict(heapq.nlargest(MAX_TERMS, weights.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        vectors.append({term: w / norm for term, w in weights.items()} if norm else {})
+    return vectors
+
+
+def build_index(vectors):
+    postings = defaultdict(list)
+    for doc, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings[term].append((weight, doc))
+    for term, entries in postings.items():
+        if len(entries) > MAX_POSTINGS:
+            postings[term] = heapq.nlargest(MAX_POSTINGS, entries)
+    return postings
+
+
+def score_blocks(queries, vectors, index, block_size=BLOCK_SIZE):
+    """Yield (query, {doc: score}) for each query, scoring a block at a time."""
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size]
+        by_term = defaultdict(list)
+        for q in block:
+            for term, weight in vectors[q].items():
+                by_term[term].append((q, weight))
+        scores = {q: defaultdict(float) for q in block}
+        for term, rows in by_term.items():
+            entries = index.get(term, ())
+            for q, weight in rows:
+                acc = scores[q]
+                for doc_weight, doc in entries:
+                    acc[doc] += weight * doc_weight
+        for q in block:
+            acc = scores[q]
+            acc.pop(q, None)
+            yield q, acc
+
+
+def dot(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def top_k(acc, k):
+    return heapq.nlargest(k, acc.items(), key=lambda item: (item[1], -item[0]))
+
+
+def update_related(learnings, k=TOP_K, rebuild=False):
+    """Fill in learning["related"] where missing or stale; returns how many changed."""
+    from publish import slug_for
+    from store import partition_key
+
+    slugs = [slug_for(learning) for learning in learnings]
+    position = {slug: i for i, slug in enumerate(slugs)}
+    stale = [
+        i for i, learning in enumerate(learnings)
+        if rebuild or learning.get("related") is None
+        or any(slug not in position for slug in learning.get("related"))
+    ]
+    if not stale:
+        return 0
+
+    vectors = build_vectors(document_text(learning) for learning in learnings)
+    index = build_index(vectors)
+    changed = set()
+    candidates = {}
+    for q, acc in score_blocks(stale, vectors, index):
+        related = [slugs[doc] for doc, score in top_k(acc, k) if score > 0]
+        if learnings[q].get("related") != related:
+            learnings[q].set("related", related)
+            changed.add(q)
+        candidates[q] = acc
+
+    if not rebuild:
+        # Similarity is symmetric, so each new learning's scores say which
+        # existing learnings it should now appear next to. Only learnings in
+        # the new ones' months take them, so older month partitions of the
+        # store stay unchanged.
+        fresh = set(stale)
+        months = {partition_key(learnings[q]) for q in stale}
+        for q, acc in candidates.items():
+            for doc, score in acc.items():
+                if doc in fresh or score <= 0 or partition_key(learnings[doc]) not in months:
+                    continue
+                current = learnings[doc].get("related") or []
+                if slugs[q] in current:
+                    continue
+                scored = [(dot(vectors[doc], vectors[position[s]]), position[s]) for s in current]
+                if len(scored) >= k and score <= min(scored)[0]:
+                    continue
+                scored.append((score, q))
+                scored = heapq.nlargest(k, scored, key=lambda item: (item[0], -item[1]))
+                learnings[doc].set("related", [slugs[i] for _, i in scored])
+                changed.add(doc)
+    return len(changed)
+
+
+def main():
+    from store import load_learnings, save_learnings
+
+    learnings = load_learnings()
+    rebuild = len(sys.argv) > 1 and sys.argv[1] == "rebuild"
+    changed = update_related(learnings, rebuild=rebuild)
+    if changed:
+        save_learnings(learnings)
+    print(f"Updated related learnings for {changed} entries.")
+
+
+if __name__ == "__main__":
+    main()
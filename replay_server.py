@@ -0,0 +1,227 @@
+"""
+Local stand-in for thedailybrief.zerodha.com.
+
+Serves /api/v1/archive and article pages (/p/<slug>) from recorded HTML or
+from synthetic posts, with configurable latency, error rate and archive size,
+so crawls can be load-tested offline:
+
+    python3 replay_server.py serve --posts 100000 --latency-ms 80 --error-rate 0.02
+    DAILY_BRIEF_BASE_URL=http://127.0.0.1:8765 CRAWL_DELAY=0 python3 backfill_free.py
+
+Record a live sample to replay later:
+
+    python3 replay_server.py record --out recordings --count 50
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from synth_corpus import generate_article
+
+
+MAX_POSTS = 100_000
+MAX_PAGE = 50
+
+
+def synthetic_article(index, seed=0):
+    article = generate_article(index, seed)
+    slug = article["url"].rsplit("/", 1)[-1]
+    title = escape(article["title"])
+    date = article["date"]
+    html = f"""<!DOCTYPE html>
+<html><head><title>{title}</title>
+<script>window._preloads = {json.dumps({"post": {"id": index}})}</script></head>
+<body><article>
+<h1 class="post-title unpublished">{title}</h1>
+<time datetime="{date}">{date[:10]}</time>
+{article["content"]}
+</article></body></html>
+"""
+    return {"slug": slug, "title": article["title"], "post_date": date, "html": html}
+
+
+class ReplayState:
+    def __init__(self, posts, latency_ms, jitter_ms, error_rate, recorded_dir, seed):
+        self.posts = min(posts, MAX_POSTS)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+        self.recorded = []
+        self.recorded_html = {}
+        if recorded_dir:
+            self.load_recorded(recorded_dir)
+
+    def load_recorded(self, directory):
+        with open(os.path.join(directory, "archive.json"), "r", encoding="utf-8") as f:
+            self.recorded = json.load(f)
+        for entry in self.recorded:
+            path = os.path.join(directory, f"{entry['slug']}.html")
+            if os.path.exists(path):
+                self.recorded_html[entry["slug"]] = path
+
+    def roll(self):
+        with self.rng_lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            failed = self.rng.random() < self.error_rate
+            status = self.rng.choice([500, 502, 503, 429]) if failed else 200
+        return delay, status
+
+    def archive(self, base_url, limit, offset):
+        limit = max(1, min(limit, MAX_PAGE))
+        if self.recorded:
+            entries = self.recorded[offset:offset + limit]
+            return [dict(entry, canonical_url=f"{base_url}/p/{entry['slug']}") for entry in entries]
+        entries = []
+        for index in range(offset, min(offset + limit, self.posts)):
+            article = synthetic_article(index, self.seed)
+            entries.append({
+                "id": index,
+                "slug": article["slug"],
+                "title": article["title"],
+                "post_date": article["post_date"],
+                "canonical_url": f"{base_url}/p/{article['slug']}",
+            })
+        return entries
+
+    def article(self, slug):
+        if slug in self.recorded_html:
+            with open(self.recorded_html[slug], "r", encoding="utf-8") as f:
+                return f.read()
+        match = re.fullmatch(r"synthetic-post-(\d+)", slug)
+        if match and int(match.group(1)) < self.posts:
+            return synthetic_article(int(match.group(1)), self.seed)["html"]
+        return None
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    state = None
+    quiet = True
+
+    def do_GET(self):
+        delay, status = self.state.roll()
+        time.sleep(delay)
+        if status != 200:
+            self.respond(status, "text/plain", b"simulated failure")
+            return
+
+        parts = urlsplit(self.path)
+        base_url = f"http://{self.headers.get('Host') or '127.0.0.1'}"
+        if parts.path.rstrip("/") == "/api/v1/archive":
+            query = parse_qs(parts.query)
+            limit = int(query.get("limit", ["12"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            body = json.dumps(self.state.archive(base_url, limit, offset)).encode("utf-8")
+            # Conditional requests for an unchanged page get a 304, for watch mode.
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.respond(304, "application/json", b"", etag=etag)
+            else:
+                self.respond(200, "application/json", body, etag=etag)
+            return
+
+        if parts.path.startswith("/p/"):
+            html = self.state.article(parts.path[3:].strip("/"))
+            if html is not None:
+                self.respond(200, "text/html; charset=utf-8", html.encode("utf-8"))
+                return
+
+        self.respond(404, "text/plain", b"not found")
+
+    def respond(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8765, posts=1000, latency_ms=0, jitter_ms=0,
+                error_rate=0.0, recorded_dir=None, seed=0, quiet=True):
+    state = ReplayState(posts, latency_ms, jitter_ms, error_rate, recorded_dir, seed)
+    handler = type("Handler", (ReplayHandler,), {"state": state, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def record(out_dir, count):
+    from archive_pager import iter_archive
+    from http_client import fetch
+
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    for article in iter_archive(max_items=count):
+        url = article.get("canonical_url") or ""
+        slug = url.rstrip("/").rsplit("/", 1)[-1]
+        if not slug:
+            continue
+        with open(os.path.join(out_dir, f"{slug}.html"), "w", encoding="utf-8") as f:
+            f.write(fetch(url))
+        entries.append({
+            "slug": slug,
+            "title": article.get("title", ""),
+            "post_date": article.get("post_date", ""),
+        })
+    with open(os.path.join(out_dir, "archive.json"), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    print(f"Recorded {len(entries)} articles to {out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Daily Brief archive/article stand-in")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="serve recorded or synthetic posts")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--posts", type=int, default=1000, help=f"synthetic archive size (max {MAX_POSTS})")
+    serve.add_argument("--latency-ms", type=float, default=0)
+    serve.add_argument("--jitter-ms", type=float, default=0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--recorded", help="directory written by the record command")
+    serve.add_argument("--seed", type=int, default=0)
+    serve.add_argument("--verbose", action="store_true")
+
+    rec = commands.add_parser("record", help="save live archive entries and article HTML")
+    rec.add_argument("--out", default="recordings")
+    rec.add_argument("--count", type=int, default=50)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.out, args.count)
+        return
+
+    server = make_server(args.host, args.port, args.posts, args.latency_ms, args.jitter_ms,
+                         args.error_rate, args.recorded, args.seed, quiet=not args.verbose)
+    print(f"Serving on http://{args.host}:{args.port} "
+          f"({server.state.posts} posts, {args.latency_ms:g}ms latency, {args.error_rate:.0%} errors)")
+    print(f"  export DAILY_BRIEF_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Newsletter sources the pipeline ingests from.
+
+Each source names its Substack-style archive API, the classes of the element
+holding the post body, the boilerplate patterns to drop, and how many
+requests per second its host may get. Sources are listed in sources.json
+(SOURCES_PATH); the Daily Brief is used when that file is missing:
+
+    [
+      {"name": "dailybrief", "base_url": "https://thedailybrief.zerodha.com",
+       "rate": 1, "boilerplate": ["our goal with the daily brief", ...]}
+    ]
+
+Omitted keys fall back to the Daily Brief defaults in extraction.py.
+"""
+
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+from archive_pager import ARCHIVE_URL, BASE_URL, ArchivePager
+from extraction import BOILERPLATE_PATTERNS, CONTAINER_CLASSES, build_learning, extract_blocks
+from http_client import set_rate_limit
+
+
+SOURCES_PATH = os.environ.get("SOURCES_PATH", "sources.json")
+ARCHIVE_PATH = "/api/v1/archive?sort=new&limit={limit}&offset={offset}"
+DEFAULT_SOURCE = "dailybrief"
+# Requests per second per host (CRAWL_DELAY, when set, overrides every source),
+# with short bursts allowed so a daily run's few fetches aren't serialized.
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 3
+
+
+class Source:
+    def __init__(self, name, base_url, archive_url=None, containers=None, boilerplate=None,
+                 rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.archive_url = archive_url or self.base_url + ARCHIVE_PATH
+        self.containers = containers or CONTAINER_CLASSES
+        self.boilerplate = re.compile("|".join(boilerplate or BOILERPLATE_PATTERNS), flags=re.I)
+        self.rate = rate
+        self.burst = burst
+        self.host = urlsplit(self.base_url).netloc.lower()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def pager(self, **kwargs):
+        return ArchivePager(archive_url=self.archive_url, **kwargs)
+
+    def iter_archive(self, **kwargs):
+        return iter(self.pager(**kwargs))
+
+    def extract_blocks(self, html):
+        return extract_blocks(html, self.containers)
+
+    def build_learning(self, blocks):
+        return build_learning(blocks, boilerplate=self.boilerplate)
+
+    def __repr__(self):
+        return f"Source({self.name!r}, {self.base_url!r})"
+
+
+def default_source():
+    # BASE_URL honours DAILY_BRIEF_BASE_URL, so offline replays keep working.
+    return Source(DEFAULT_SOURCE, BASE_URL, archive_url=ARCHIVE_URL)
+
+
+def crawl_rate(source):
+    delay = os.environ.get("CRAWL_DELAY")
+    if delay is None:
+        return source.rate
+    delay = float(delay)
+    return 1 / delay if delay > 0 else 0
+
+
+def load_sources(path=None):
+    path = path or SOURCES_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = None
+    sources = []
+    for item in data or []:
+        if item.get("name") == DEFAULT_SOURCE and "DAILY_BRIEF_BASE_URL" in os.environ:
+            item = dict(item, base_url=BASE_URL)
+        sources.append(Source.from_dict(item))
+    if not sources:
+        sources = [default_source()]
+    for source in sources:
+        set_rate_limit(source.base_url, crawl_rate(source), source.burst)
+    return sources
+
+
+_sources = None
+
+
+def get_sources():
+    global _sources
+    if _sources is None:
+        _sources = load_sources()
+    return _sources
+
+
+def source_for(url, sources=None):
+    """The source whose host serves ``url``, else the first (default) source."""
+    sources = sources or get_sources()
+    host = urlsplit(url or "").netloc.lower()
+    for source in sources:
+        if source.host == host:
+            return source
+    return sources[0]
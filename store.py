@@ -0,0 +1,180 @@
+import json
+import os
+import sys
+from textwrap import indent
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from build_graph import write_if_changed
+from dates import normalize_date, timestamp
+from records import Learning, load_records
+
+
+# A directory holds the store as one file per month (see save_learnings); a
+# path ending in .json is a single-file store.
+LEARNINGS_PATH = os.environ.get("LEARNINGS_PATH", "data")
+INDEX_NAME = "index.json"
+# Where the default store lived before it was partitioned, next to it; read
+# until the first save.
+LEGACY_PATH = "learnings.json"
+
+# The store is kept newest-first. Undated learnings sort after every dated one.
+UNDATED = float("inf")
+
+
+def sort_key(learning):
+    ts = timestamp(learning.date)
+    return UNDATED if ts is None else -ts
+
+
+def is_partitioned(path):
+    return not path.endswith(".json")
+
+
+def partition_key(learning):
+    # Canonical dates start with YYYY-MM.
+    return learning.date[:7] if learning.date else "undated"
+
+
+def partition_name(key):
+    return f"learnings-{key}.json"
+
+
+def load_index(path):
+    try:
+        with open(os.path.join(path, INDEX_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)["partitions"]
+    except FileNotFoundError:
+        return None
+
+
+def load_learnings(path=LEARNINGS_PATH, lazy=True):
+    # Lazy records leave their bodies in the file until something reads them.
+    if is_partitioned(path):
+        partitions = load_index(path)
+        if partitions is None:
+            # Only the default store migrates: any other directory without an
+            # index is a new, empty store.
+            if path != LEARNINGS_PATH:
+                return []
+            legacy = os.path.join(os.path.dirname(os.path.normpath(path)), LEGACY_PATH)
+            return load_learnings(legacy, lazy=lazy)
+        # Partitions are listed newest month first, so this is store order.
+        # A listed partition that is missing or corrupt is an error, not an
+        # empty store.
+        learnings = []
+        for partition in partitions:
+            learnings += load_records(os.path.join(path, partition["path"]), lazy=lazy)
+        return learnings
+    # Only a missing file means an empty store. A corrupt one must stop the
+    # run, or the next save would overwrite it.
+    try:
+        return load_records(path, lazy=lazy)
+    except FileNotFoundError:
+        return []
+
+
+def render_records(learnings):
+    # Same layout as json.dump(..., indent=2), built one record at a time.
+    if not learnings:
+        return "[]"
+    parts = []
+    for i, learning in enumerate(learnings):
+        parts.append(",\n" if i else "[\n")
+        parts.append(indent(json.dumps(learning.to_dict(), indent=2), "  "))
+    parts.append("\n]")
+    return "".join(parts)
+
+
+def save_learnings(learnings, path=LEARNINGS_PATH):
+    """Write the store; returns the paths that changed.
+
+    A partitioned store keeps one file per month plus an index listing them
+    newest first. Only files whose content changed are rewritten, so adding
+    a learning touches its month and the index, not the whole history.
+    """
+    if not is_partitioned(path):
+        write_if_changed(path, render_records(learnings))
+        return [path]
+
+    groups = {}
+    for learning in learnings:
+        groups.setdefault(partition_key(learning), []).append(learning)
+    previous = load_index(path) or []
+    written = []
+    partitions = []
+    for key, items in groups.items():
+        name = partition_name(key)
+        if write_if_changed(os.path.join(path, name), render_records(items)):
+            written.append(os.path.join(path, name))
+        partitions.append({"month": key, "path": name, "count": len(items)})
+    index_path = os.path.join(path, INDEX_NAME)
+    # The index goes last: until it is replaced, readers see the old partitions.
+    if write_if_changed(index_path, json.dumps({"partitions": partitions}, indent=2) + "\n"):
+        written.append(index_path)
+    current = {partition["path"] for partition in partitions}
+    for partition in previous:
+        if partition["path"] not in current:
+            stale = os.path.join(path, partition["path"])
+            if os.path.exists(stale):
+                os.remove(stale)
+                written.append(stale)
+    return written
+
+
+def new_learning(learning, url, title, date):
+    return Learning(learning=learning, article_url=url, title=title, date=date)
+
+
+def normalize_learning(learning):
+    learning.date = sys.intern(normalize_date(learning.date))
+    return learning
+
+
+def insert_learning(learnings, learning):
+    normalize_learning(learning)
+    # bisect_left puts a learning ahead of existing ones with the same date,
+    # so the most recently ingested of a tie shows first.
+    index = bisect_left(learnings, sort_key(learning), key=sort_key)
+    learnings.insert(index, learning)
+    return index
+
+
+def sort_learnings(learnings):
+    for learning in learnings:
+        normalize_learning(learning)
+    learnings.sort(key=sort_key)
+    return learnings
+
+
+def between(learnings, start, end):
+    # Dates are inclusive of start and exclusive of end: bisect_right skips
+    # learnings dated exactly at end (keys are negated timestamps).
+    lo = bisect_right(learnings, -timestamp(end), key=sort_key)
+    hi = bisect_right(learnings, -timestamp(start), key=sort_key)
+    return learnings[lo:hi]
+
+
+def last_days(learnings, days, now=None):
+    now = now or datetime.now(timezone.utc)
+    return between(learnings, now - timedelta(days=days), now + timedelta(seconds=1))
+
+
+def in_month(learnings, year, month):
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return between(learnings, start, end)
+
+
+def main():
+    if sys.argv[1:] != ["normalize"]:
+        print("Usage: python3 store.py normalize")
+        return
+    learnings = sort_learnings(load_learnings())
+    save_learnings(learnings)
+    undated = sum(1 for learning in learnings if not learning.date)
+    print(f"Normalized {len(learnings)} learnings ({undated} undated).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+// Generated by precache.py: edit SW_SOURCE there, not this file.
+const CACHE_NAME = "daily-learnings-precache-v2";
+const MANIFEST_PATH = "precache-manifest.json";
+
+const SCOPE = self.registration.scope;
+
+function urlFor(path) {
+    return new URL(path, SCOPE).href;
+}
+
+async function sha1(buffer) {
+    const digest = await crypto.subtle.digest('SHA-1', buffer);
+    return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+async function storedManifest(cache) {
+    const response = await cache.match(urlFor(MANIFEST_PATH));
+    return response ? response.json() : { version: null, assets: {}, pages: {} };
+}
+
+// Fetch a file and check it against the manifest, since a CDN may still
+// serve the previous copy for a while after a publish.
+async function fetchVerified(path, hash) {
+    const response = await fetch(urlFor(path), { cache: 'no-cache' });
+    if (!response.ok || response.redirected) {
+        throw new Error(`Could not fetch ${path}: ${response.status}`);
+    }
+    if (await sha1(await response.clone().arrayBuffer()) !== hash) {
+        throw new Error(`${path} does not match the manifest yet`);
+    }
+    return response;
+}
+
+async function update() {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await fetch(urlFor(MANIFEST_PATH), { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`Could not fetch the manifest: ${response.status}`);
+    }
+    const manifest = await response.json();
+    const stored = await storedManifest(cache);
+    if (manifest.version === stored.version) return;
+
+    // All changed shell files or none, so index.html and the deltas
+    // manifest always come from the same publish.
+    const changed = Object.entries(manifest.assets).filter(([path, hash]) => stored.assets[path] !== hash);
+    const fresh = await Promise.all(changed.map(([path, hash]) => fetchVerified(path, hash)));
+    await Promise.all(fresh.map((file, i) => cache.put(urlFor(changed[i][0]), file)));
+
+    const stale = [
+        ...Object.keys(stored.assets).filter((path) => !(path in manifest.assets)),
+        ...Object.keys(stored.pages).filter((path) => stored.pages[path] !== manifest.pages[path]),
+    ];
+    await Promise.all(stale.map((path) => cache.delete(urlFor(path))));
+    await cache.put(urlFor(MANIFEST_PATH), new Response(JSON.stringify(manifest), {
+        headers: { 'Content-Type': 'application/json' },
+    }));
+}
+
+let updating = null;
+
+function refresh() {
+    if (!updating) {
+        updating = update().catch((error) => console.warn('Precache update failed:', error)).finally(() => {
+            updating = null;
+        });
+    }
+    return updating;
+}
+
+async function respond(request, path) {
+    const cache = await caches.open(CACHE_NAME);
+    const manifest = await storedManifest(cache);
+    if (!(path in manifest.assets) && !(path in manifest.pages)) {
+        return fetch(request);
+    }
+    const cached = await cache.match(urlFor(path));
+    if (cached) return cached;
+    if (path in manifest.pages) {
+        try {
+            const response = await fetchVerified(path, manifest.pages[path]);
+            await cache.put(urlFor(path), response.clone());
+            return response;
+        } catch (error) {
+            // Not published yet, or served stale: don't keep it.
+        }
+    }
+    return fetch(request);
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(update().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name.startsWith('daily-learnings-') && name !== CACHE_NAME) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(SCOPE)) return;
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    let path = url.href.slice(SCOPE.length);
+    if (path === '' || path.endsWith('/')) path += 'index.html';
+    if (path === MANIFEST_PATH) return;
+    event.respondWith(respond(request, path));
+    if (request.mode === 'navigate') {
+        // Answer from the cache now; a newer publish is picked up for next time.
+        event.waitUntil(refresh());
+    }
+});
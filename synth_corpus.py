@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Synthetic Daily Brief corpus generator - realistic Substack-style articles at any scale
+
+Writes the same shape as articles-full-content.json (url, title, date, content),
+as a JSON list or streamed JSONL, for scaling tests of the extractors:
+
+    python3 synth_corpus.py corpus-10k.jsonl --count 10000
+    python3 synth_corpus.py corpus-1m.jsonl --count 1000000 --median-words 1400 --sigma 0.6
+"""
+
+import argparse
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from html import escape
+
+
+BASE_URL = "https://thedailybrief.zerodha.com"
+EPOCH = datetime(2026, 1, 31, 3, 0, tzinfo=timezone.utc)
+
+WORDS = (
+    "market bank rupee inflation capex budget copper steel export tariff margin "
+    "revenue demand supply growth credit rate policy deficit government company "
+    "investor quarter price capacity cement power battery consumer retail rural "
+    "urban import subsidy earnings valuation liquidity fiscal monetary household "
+    "the of and to in that is for on with as it by from which this are was but"
+).split()
+
+ABBREVIATIONS = ["Rs.", "U.S.", "Ltd.", "approx.", "e.g.", "Dr."]
+
+INTRO = [
+    "Our goal with The Daily Brief is to simplify the biggest stories in the Indian markets and help you understand what they mean.",
+    "You can check out the audio version on Spotify or Apple Podcasts, and if you prefer video, watch it on YouTube.",
+    "In today's edition, we look at three stories that caught our eye: {topics}.",
+    "For those of you who are new here, I'm your host, and we do this show in both formats.",
+]
+
+OUTRO = [
+    "This content is for informational purposes only and should not be construed as investment advice.",
+    "We publish a new episode every day. Share this post, leave a comment and subscribe to The Daily Brief on Substack.",
+    "Thanks for reading The Daily Brief! Subscribe for free to receive new posts and support our work.",
+]
+
+WIDGETS = [
+    '<div class="subscription-widget-wrap"><div class="subscription-widget show-subscribe">'
+    '<p class="cta-caption">Thanks for reading! Subscribe for free to receive new posts.</p>'
+    '<form class="subscription-widget-subscribe"><input type="email" class="email-input" name="email">'
+    '<input type="submit" class="button primary" value="Subscribe"></form></div></div>',
+    '<div class="captioned-image-container"><figure><a class="image-link image2" href="#">'
+    '<img src="https://substackcdn.com/image/fetch/w_1456/x.png" width="1456" height="816" alt=""></a>'
+    '<figcaption class="image-caption">Source: company filings, RBI</figcaption></figure></div>',
+    '<p class="button-wrapper"><a class="button primary" href="#"><span>Share</span></a></p>',
+    '<script>window._analyticsConfig = {"properties": {"subdomain": "thedailybriefing"}}</script>',
+]
+
+
+def sentence(rng, min_words=8, max_words=26):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    if rng.random() < 0.08:
+        words.insert(rng.randrange(len(words)), rng.choice(ABBREVIATIONS))
+    if rng.random() < 0.15:
+        words.insert(rng.randrange(len(words)), f"₹{rng.randint(2, 900):,} crore")
+    return " ".join(words).capitalize() + rng.choice(".....?!")
+
+
+def paragraph(rng, target_words):
+    parts = []
+    count = 0
+    while count < target_words:
+        text = sentence(rng)
+        parts.append(text)
+        count += text.count(" ") + 1
+    return " ".join(parts)
+
+
+def article_words(rng, median_words, sigma):
+    return max(150, int(rng.lognormvariate(math.log(median_words), sigma)))
+
+
+def article_body(rng, total_words):
+    topics = ", ".join(" ".join(rng.choice(WORDS[:40]) for _ in range(2)) for _ in range(3))
+    blocks = [f"<p>{escape(line.format(topics=topics))}</p>" for line in rng.sample(INTRO, rng.randint(2, 4))]
+    blocks.append("<hr>")
+    written = 0
+    while written < total_words:
+        roll = rng.random()
+        if roll < 0.08:
+            blocks.append(f"<h2>{escape(sentence(rng, 3, 8)[:-1])}</h2>")
+        elif roll < 0.14:
+            items = "".join(f"<li><p>{escape(sentence(rng))}</p></li>" for _ in range(rng.randint(2, 5)))
+            blocks.append(f"<ul>{items}</ul>")
+            written += 60
+        elif roll < 0.18:
+            blocks.append(f"<blockquote><p>{escape(paragraph(rng, 40))}</p></blockquote>")
+            written += 40
+        elif roll < 0.22:
+            blocks.append(rng.choice(WIDGETS))
+        else:
+            words = rng.randint(40, 140)
+            text = escape(paragraph(rng, words))
+            if rng.random() < 0.2:
+                text = text.replace(" the ", " <strong>the</strong> ", 1).replace(" of ", ' <a href="#">of</a> ', 1)
+            blocks.append(f"<p>{text}</p>")
+            written += words
+    blocks += [f"<p>{escape(line)}</p>" for line in rng.sample(OUTRO, 2)]
+    return (
+        '<div class="available-content"><div dir="auto" class="body markup">'
+        + "".join(blocks)
+        + "</div></div>"
+    )
+
+
+def generate_article(index, seed=0, median_words=1200, sigma=0.5):
+    rng = random.Random(seed * 1_000_003 + index)
+    title = " ".join(rng.choice(WORDS[:40]) for _ in range(rng.randint(3, 8))).capitalize()
+    slug = f"synthetic-post-{index}"
+    return {
+        "url": f"{BASE_URL}/p/{slug}",
+        "title": title,
+        "date": (EPOCH - timedelta(days=index)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "content": article_body(rng, article_words(rng, median_words, sigma)),
+    }
+
+
+def iter_synthetic(count, seed=0, median_words=1200, sigma=0.5):
+    for index in range(count):
+        yield generate_article(index, seed, median_words, sigma)
+
+
+def write_corpus(path, articles):
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for article in articles:
+                f.write(json.dumps(article, ensure_ascii=False))
+                f.write("\n")
+                written += 1
+        else:
+            # Streamed by hand so a million posts never sit in memory at once.
+            f.write("[")
+            for article in articles:
+                f.write(",\n" if written else "\n")
+                f.write(json.dumps(article, ensure_ascii=False))
+                written += 1
+            f.write("\n]\n")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Daily Brief corpus")
+    parser.add_argument("output", help="output path (.json for a list, .jsonl for one article per line)")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--median-words", type=int, default=1200, help="median article length in words")
+    parser.add_argument("--sigma", type=float, default=0.5, help="log-normal spread of article length")
+    args = parser.parse_args()
+
+    written = write_corpus(args.output, iter_synthetic(args.count, args.seed, args.median_words, args.sigma))
+    print(f"Wrote {written} articles to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
-import json
+import os
+import sys
 from html.parser import HTMLParser
 
+from corpus import iter_articles
+
 class TextExtractor(HTMLParser):
     def __init__(self):
         super().__init__()
@@ -20,11 +23,10 @@ class TextExtractor(HTMLParser):
         if self.in_p:
             self.text.append(data)
 
-with open('/home/krishna.lohia/articles-full-content.json', 'r') as f:
-    articles = json.load(f)
+path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('ARTICLES_PATH', 'articles-full-content.json')
 
 # Look at first article
-article = articles[0]
+article = next(iter_articles(path))
 print(f"Title: {article['title']}\n")
 print(f"URL: {article['url']}\n")
 
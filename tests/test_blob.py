@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blob import ENTRY, BlobReader, build_blob, render_shards, shard_paths, shards_path, split_shards  # noqa: E402
+from records import Learning  # noqa: E402
+from store import sort_learnings  # noqa: E402
+
+
+def learnings():
+    return sort_learnings([
+        Learning(learning="Plain ASCII body.", article_url="https://example.com/p/a", title="A",
+                 date="2025-10-02T00:00:00Z"),
+        Learning(learning="₹1,200 crore — naïve “quotes”\nand a second line 🚀", article_url="https://example.com/p/b",
+                 title="Rupees ₹", date="2025-10-30T00:00:00Z"),
+        Learning(learning="Größe und Maß", article_url="https://example.com/p/c", title="Ümlaut",
+                 date="2025-11-01T00:00:00Z", source="other"),
+        Learning(learning="", article_url="https://example.com/p/d", title="Undated"),
+    ])
+
+
+class BlobTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.learnings = learnings()
+        self.shards = split_shards(self.learnings)
+        start = 0
+        for key, count in self.shards:
+            blob, index = build_blob(self.learnings[start:start + count])
+            start += count
+            path, index_path = shard_paths(key, self.directory)
+            for target, data in ((path, blob), (index_path, index)):
+                with open(target, "wb") as f:
+                    f.write(data)
+        with open(shards_path(self.directory), "w", encoding="utf-8") as f:
+            f.write(render_shards(self.shards))
+
+    def test_shards_follow_store_order(self):
+        self.assertEqual(self.shards, [("2025-11", 1), ("2025-10", 2), ("undated", 1)])
+        # A month split around another can't be one shard.
+        november, late_october, early_october, undated = self.learnings
+        with self.assertRaises(ValueError):
+            split_shards([late_october, november, early_october, undated])
+
+    def test_index_entries_slice_each_record_by_byte_range(self):
+        # What index.html does with two Range requests per learning.
+        start = 0
+        for key, count in self.shards:
+            path, index_path = shard_paths(key, self.directory)
+            with open(path, "rb") as f:
+                blob = f.read()
+            with open(index_path, "rb") as f:
+                index = f.read()
+            self.assertEqual(len(index), count * ENTRY.size)
+            for i in range(count):
+                offset, length = ENTRY.unpack(index[i * ENTRY.size:(i + 1) * ENTRY.size])
+                record = json.loads(blob[offset:offset + length].decode("utf-8"))
+                self.assertEqual(record, self.learnings[start + i].to_dict())
+                self.assertEqual(blob[offset + length:offset + length + 1], b"\n")
+            start += count
+
+    def test_reader_round_trips_every_learning(self):
+        with BlobReader(self.directory) as reader:
+            self.assertEqual(len(reader), len(self.learnings))
+            self.assertEqual([reader[i] for i in range(len(reader))], [item.to_dict() for item in self.learnings])
+            self.assertEqual(reader[-1]["title"], "Undated")
+            with self.assertRaises(IndexError):
+                reader.raw(len(self.learnings))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deltas  # noqa: E402
+from build_graph import content_hash  # noqa: E402
+from deltas import MANIFEST_PATH, delta_path, diff, publish_deltas  # noqa: E402
+from publish import slug_for  # noqa: E402
+from records import Learning  # noqa: E402
+
+
+def learning(slug, body="Body."):
+    return Learning(learning=body, article_url=f"https://example.com/p/{slug}", title=slug.title())
+
+
+def apply_delta(records, delta):
+    # Mirrors applyDelta in index.html.
+    drop = set(delta["removed"]) | {slug_for(Learning.from_dict(record)) for _, record in delta["added"]}
+    result = [record for record in records if slug_for(Learning.from_dict(record)) not in drop]
+    for index, record in delta["added"]:
+        result.insert(index, record)
+    return result
+
+
+class DiffTest(unittest.TestCase):
+    def replay(self, old, new):
+        removed, added = diff(old, new)
+        touched = set(removed) | {new[i][0] for i in added}
+        result = [entry for entry in old if entry[0] not in touched]
+        for i in added:
+            result.insert(i, new[i])
+        return result, removed, added
+
+    def test_add_edit_and_delete(self):
+        old = [("c", "3"), ("b", "2"), ("a", "1")]
+        new = [("d", "4"), ("c", "3"), ("b", "2*")]
+        result, removed, added = self.replay(old, new)
+        self.assertEqual(result, new)
+        self.assertEqual(removed, ["a", "b"])
+        self.assertEqual(added, [0, 2])
+
+    def test_unchanged_learnings_are_not_sent(self):
+        old = [("b", "2"), ("a", "1")]
+        self.assertEqual(diff(old, [("c", "3")] + old), ([], [0]))
+
+    def test_duplicate_slugs_have_no_delta(self):
+        self.assertIsNone(diff([("a", "1")], [("a", "1"), ("a", "2")]))
+
+
+class PublishDeltasTest(unittest.TestCase):
+    def setUp(self):
+        cwd = os.getcwd()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.chdir(directory.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def publish(self, learnings):
+        hashes = [content_hash(item.to_dict()) for item in learnings]
+        publish_deltas(learnings, hashes, [slug_for(item) for item in learnings])
+        return [item.to_dict() for item in learnings]
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def catch_up(self, records, version):
+        manifest = self.read(MANIFEST_PATH)
+        self.assertLessEqual(manifest["since"], version)
+        for v in range(version + 1, manifest["version"] + 1):
+            delta = self.read(delta_path(v))
+            self.assertEqual(delta["previous"], v - 1)
+            records = apply_delta(records, delta)
+        return records
+
+    def test_a_copy_several_versions_behind_catches_up(self):
+        v1 = self.publish([learning("b"), learning("a")])
+        v2 = self.publish([learning("c"), learning("b"), learning("a")])
+        v3 = self.publish([learning("d"), learning("c"), learning("b", "Edited.")])
+        self.assertEqual(self.read(MANIFEST_PATH), {"version": 3, "since": 1, "count": 3})
+        self.assertEqual(self.catch_up(v1, 1), v3)
+        self.assertEqual(self.catch_up(v2, 2), v3)
+        self.assertEqual(self.catch_up(v3, 3), v3)
+
+    def test_an_unchanged_store_keeps_its_version(self):
+        self.publish([learning("a")])
+        self.assertEqual(self.publish([learning("a")]), [learning("a").to_dict()])
+        self.assertEqual(self.read(MANIFEST_PATH)["version"], 1)
+
+    def test_old_deltas_are_pruned(self):
+        with mock.patch.object(deltas, "MAX_DELTAS", 2):
+            records = []
+            for slug in "abcde":
+                records = self.publish([learning(slug)] + [Learning.from_dict(r) for r in records])
+        manifest = self.read(MANIFEST_PATH)
+        self.assertEqual((manifest["version"], manifest["since"]), (5, 3))
+        self.assertFalse(os.path.exists(delta_path(3)))
+        self.assertTrue(os.path.exists(delta_path(4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
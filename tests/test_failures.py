@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from failures import MAX_ATTEMPTS, FailedQueue  # noqa: E402
+
+URL = "https://example.com/p/post"
+
+
+class FailedQueueTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "failed_urls.json")
+
+    def test_queue_survives_a_save(self):
+        failed = FailedQueue(self.path)
+        failed.record(URL, TimeoutError("timed out"), "2025-11-01T00:00:00Z")
+        failed.save()
+        reloaded = FailedQueue(self.path)
+        self.assertEqual(reloaded.pending(), [{"canonical_url": URL, "post_date": "2025-11-01T00:00:00Z"}])
+        self.assertEqual(reloaded.entries[URL]["error"], "TimeoutError: timed out")
+
+    def test_gives_up_after_max_attempts(self):
+        failed = FailedQueue(self.path)
+        for attempt in range(MAX_ATTEMPTS):
+            self.assertEqual(len(failed), 1 if attempt else 0)
+            failed.record(URL, ConnectionError("reset"))
+        self.assertEqual(failed.pending(), [])
+        self.assertEqual(failed.summary(), "0 queued for retry, 1 given up")
+
+    def test_resolve_forgets_attempts(self):
+        failed = FailedQueue(self.path)
+        failed.record(URL, ConnectionError("reset"))
+        failed.resolve(URL)
+        failed.record(URL, ConnectionError("reset"))
+        self.assertEqual(failed.entries[URL]["attempts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors import THRESHOLDS, load_strategy  # noqa: E402
+from features import FeatureCache  # noqa: E402
+from synth_corpus import iter_synthetic  # noqa: E402
+
+
+class SelectTest(unittest.TestCase):
+    def test_default_thresholds_match_the_extractors(self):
+        articles = list(iter_synthetic(40, seed=3))
+        cache = FeatureCache.build(articles)
+        for strategy, thresholds in THRESHOLDS.items():
+            module = load_strategy(strategy)
+            expected = [learning for learning in map(module.extract_learning, articles) if learning]
+            self.assertTrue(expected)
+            self.assertEqual(cache.learnings(strategy, thresholds), expected, strategy)
+
+
+if __name__ == "__main__":
+    unittest.main()
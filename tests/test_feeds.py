@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feeds import publish_feeds  # noqa: E402
+from records import Learning  # noqa: E402
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def learning(day, body):
+    return Learning(
+        learning=body,
+        article_url=f"https://example.com/p/post-{day}",
+        title=f"Post\non day {day}",
+        date=f"2025-11-{day:02d}T00:00:00Z",
+    )
+
+
+class IncrementalFeedTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def publish(self, learnings):
+        pages = [f"learning/{learning.slug}.html" for learning in learnings]
+        publish_feeds(learnings, pages)
+        rss = ET.parse("feed.xml").getroot()
+        atom = ET.parse("atom.xml").getroot()
+        with open("feed.json", "r", encoding="utf-8") as f:
+            items = json.load(f)["items"]
+        return rss, atom, items
+
+    def test_multiline_bodies_survive_a_second_publish(self):
+        body = "First paragraph\nwith a line break.\n\nSecond & last paragraph."
+        learnings = [learning(2, body), learning(1, "Short body.")]
+        rss, atom, items = self.publish(learnings)
+        self.assertEqual(len(rss.findall("channel/item")), 2)
+
+        # The second run copies both old items from disk and renders one new one.
+        learnings.insert(0, learning(3, "Newest\nbody."))
+        rss, atom, items = self.publish(learnings)
+        rss_items = rss.findall("channel/item")
+        entries = atom.findall(f"{ATOM}entry")
+        self.assertEqual(len(rss_items), 3)
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(len(items), 3)
+        self.assertEqual(rss_items[1].findtext("title"), "Post\non day 2")
+        self.assertIn("<p>First paragraph\nwith a line break.</p>", rss_items[1].findtext("description"))
+        self.assertIn("<p>Second &amp; last paragraph.</p>", entries[1].findtext(f"{ATOM}content"))
+        self.assertEqual(items[1]["content_html"], rss_items[1].findtext("description"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import email.message
+import os
+import sys
+import threading
+import unittest
+import urllib.error
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client  # noqa: E402
+from http_client import (  # noqa: E402
+    BACKOFF_CAP, BREAKER_THRESHOLD, CircuitBreaker, CircuitOpenError, backoff_delay, fetch,
+)
+from replay_server import make_server  # noqa: E402
+
+
+def http_error(code, retry_after=None):
+    headers = email.message.Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    return urllib.error.HTTPError("http://example.com/", code, "error", headers, None)
+
+
+class BackoffTest(unittest.TestCase):
+    def test_retry_after_seconds_are_honoured_up_to_the_cap(self):
+        self.assertEqual(backoff_delay(0, http_error(429, "3")), 3.0)
+        self.assertEqual(backoff_delay(0, http_error(503, "600")), BACKOFF_CAP)
+
+    def test_jitter_stays_under_the_exponential_bound(self):
+        # An HTTP-date Retry-After is ignored in favour of the usual backoff.
+        for attempt in range(8):
+            delay = backoff_delay(attempt, http_error(503, "Wed, 21 Oct 2015 07:28:00 GMT"))
+            self.assertLessEqual(delay, min(BACKOFF_CAP, http_client.BACKOFF_BASE * 2 ** attempt))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_half_open_lets_one_trial_through(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_stays_open_during_cooldown(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=60)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+
+class ReplayFetchTest(unittest.TestCase):
+    def serve(self, error_rate):
+        # A fresh port is a fresh host, so every test gets its own breaker.
+        server = make_server(port=0, posts=5, error_rate=error_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        sleep = mock.patch.object(http_client.time, "sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_transient_errors_are_retried_then_raised(self):
+        server, base = self.serve(error_rate=1.0)
+        with self.assertRaises(urllib.error.HTTPError):
+            fetch(f"{base}/p/synthetic-post-0", retries=2)
+        self.assertEqual(server.state.requests, 3)
+
+    def test_not_found_is_not_retried(self):
+        server, base = self.serve(error_rate=0.0)
+        with self.assertRaises(urllib.error.HTTPError):
+            fetch(f"{base}/p/missing", retries=2)
+        self.assertEqual(server.state.requests, 1)
+        self.assertIn("<article>", fetch(f"{base}/p/synthetic-post-0"))
+
+    def test_breaker_opens_after_repeated_failures(self):
+        server, base = self.serve(error_rate=1.0)
+        url = f"{base}/p/synthetic-post-0"
+        for _ in range(BREAKER_THRESHOLD):
+            with self.assertRaises(urllib.error.HTTPError):
+                fetch(url, retries=0)
+        with self.assertRaises(CircuitOpenError):
+            fetch(url, retries=0)
+        self.assertEqual(server.state.requests, BREAKER_THRESHOLD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_guard  # noqa: E402
+from parse_guard import ArticleRejected, ParsePool, ParseUnavailable, Quarantine  # noqa: E402
+
+CONTAINERS = ["available-content"]
+SMALL = "<div class='available-content'><p>hello there</p></div>"
+# Takes well over the test timeout to parse.
+SLOW = "<div class='available-content'>" + "<p>word " * 400_000 + "</div>"
+
+
+class DeadProcess:
+    """A worker process that exits before saying it is ready."""
+
+    def __init__(self, target, args, daemon):
+        pass
+
+    def start(self):
+        pass
+
+    def kill(self):
+        pass
+
+    def join(self):
+        pass
+
+
+class DeadContext:
+    def Pipe(self):
+        return multiprocessing.Pipe()
+
+    Process = DeadProcess
+
+
+class ParsePoolTest(unittest.TestCase):
+    def test_timeouts_kill_workers_without_starving_waiters(self):
+        pool = ParsePool(size=1, timeout=0.05)
+        errors = []
+
+        def run():
+            try:
+                pool.parse(SLOW, CONTAINERS)
+            except ArticleRejected as error:
+                errors.append(str(error))
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(errors, ["parse exceeded 0.05s"] * 3)
+        self.assertEqual(pool.started, 0)
+        # A replacement worker parses normally.
+        pool.timeout = 10
+        self.assertEqual([block.text for block in pool.parse(SMALL, CONTAINERS)], ["hello there"])
+        self.assertEqual(pool.started, 1)
+
+    def test_failed_start_frees_its_slot(self):
+        pool = ParsePool(size=1, timeout=10)
+        pool.context = DeadContext()
+        for _ in range(2):
+            with self.assertRaises(ParseUnavailable):
+                pool.parse(SMALL, CONTAINERS)
+        self.assertEqual(pool.started, 0)
+
+
+class FetchArticleTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.quarantine = Quarantine(os.path.join(directory.name, "quarantine.jsonl"))
+        self.source = SimpleNamespace(containers=CONTAINERS)
+        for name, value in (("quarantine", self.quarantine), ("_pool", None)):
+            patcher = mock.patch.object(parse_guard, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, url, html):
+        with mock.patch.object(parse_guard, "fetch", return_value=html):
+            return parse_guard.fetch_article(url, self.source)
+
+    def test_timeout_is_quarantined(self):
+        parse_guard._pool = ParsePool(size=1, timeout=0.05)
+        self.assertEqual(self.fetch("https://example.com/p/slow", SLOW), ("", []))
+        self.assertEqual(self.quarantine.urls(), {"https://example.com/p/slow"})
+
+    def test_worker_start_failure_is_not_quarantined(self):
+        parse_guard._pool = ParsePool(size=1, timeout=10)
+        parse_guard._pool.context = DeadContext()
+        with self.assertRaises(ParseUnavailable):
+            self.fetch("https://example.com/p/fine", SMALL)
+        self.assertEqual(self.quarantine.urls(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import BodySource, Learning, load_records  # noqa: E402
+from store import render_records  # noqa: E402
+
+
+class LazyBodyTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "learnings.json")
+        self.learnings = [
+            Learning(learning="First body, ₹ and all.", article_url="https://example.com/p/a", title="A"),
+            Learning(learning="Second body.", article_url="https://example.com/p/b", title="B", topic="x"),
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(render_records(self.learnings))
+
+    def test_body_is_read_once(self):
+        records = load_records(self.path)
+        self.addCleanup(records[0]._source.file.close)
+        with mock.patch.object(BodySource, "read", autospec=True, side_effect=BodySource.read) as read:
+            for _ in range(3):
+                self.assertEqual(records[0].learning, "First body, ₹ and all.")
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(records, self.learnings)
+
+    def test_source_closes_as_a_context_manager(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        start = data.index(b"{")
+        end = data.index(b"}", start) + 1
+        with BodySource(self.path) as source:
+            self.assertEqual(source.read(start, end - start), json.loads(data[start:end])["learning"])
+        self.assertTrue(source.file.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Learning  # noqa: E402
+from store import LEARNINGS_PATH, between, in_month, last_days, load_learnings, save_learnings, sort_learnings  # noqa: E402
+
+
+def dated(*dates):
+    return sort_learnings([Learning(title=date or "undated", date=date) for date in dates])
+
+
+class RangeQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.learnings = dated(
+            "2025-10-01T00:00:00Z",
+            "2025-10-31T23:59:59Z",
+            "2025-11-01T00:00:00Z",
+            "2025-11-15T12:00:00Z",
+            "",
+        )
+
+    def dates(self, learnings):
+        return [learning.date for learning in learnings]
+
+    def test_month_boundaries_are_half_open(self):
+        self.assertEqual(
+            self.dates(in_month(self.learnings, 2025, 10)),
+            ["2025-10-31T23:59:59Z", "2025-10-01T00:00:00Z"],
+        )
+        self.assertEqual(
+            self.dates(in_month(self.learnings, 2025, 11)),
+            ["2025-11-15T12:00:00Z", "2025-11-01T00:00:00Z"],
+        )
+
+    def test_between_includes_start_and_excludes_end(self):
+        start = datetime(2025, 10, 31, 23, 59, 59, tzinfo=timezone.utc)
+        end = datetime(2025, 11, 15, 12, tzinfo=timezone.utc)
+        self.assertEqual(
+            self.dates(between(self.learnings, start, end)),
+            ["2025-11-01T00:00:00Z", "2025-10-31T23:59:59Z"],
+        )
+
+    def test_december_rolls_into_next_year(self):
+        learnings = dated("2025-12-31T23:00:00Z", "2026-01-01T00:00:00Z")
+        self.assertEqual(self.dates(in_month(learnings, 2025, 12)), ["2025-12-31T23:00:00Z"])
+
+    def test_last_days_skips_undated(self):
+        now = datetime(2025, 11, 15, 12, tzinfo=timezone.utc)
+        self.assertEqual(
+            self.dates(last_days(self.learnings, 15, now=now)),
+            ["2025-11-15T12:00:00Z", "2025-11-01T00:00:00Z", "2025-10-31T23:59:59Z"],
+        )
+
+
+class LoadTest(unittest.TestCase):
+    def test_missing_file_is_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(load_learnings(os.path.join(directory, "learnings.json")), [])
+
+    def test_corrupt_file_raises(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "learnings.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('[{"title": "truncated"')
+            with self.assertRaises(ValueError):
+                load_learnings(path)
+
+    def test_new_store_ignores_a_stray_legacy_file(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                save_learnings([Learning(title="stray")], "learnings.json")
+                self.assertEqual(load_learnings(os.path.join(directory, "store")), [])
+                # The default store still migrates from the file next to it.
+                self.assertEqual([learning.title for learning in load_learnings(LEARNINGS_PATH)], ["stray"])
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topics import PHRASE_RE, PHRASE_TAGS, build_facets, trie_pattern  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXTS = [
+    "The RBI held the repo rate; a rate cut is unlikely, and interest rates stay high.",
+    "Rate cuts, rated bonds and a rates desk: income tax, taxes, GST and cess.",
+    "EVs and cars: carmakers, an automaker, the car's battery and batteries.",
+    "Steelmakers, steel, iron ore; an evening with oil, coal and crude.",
+    "AI chips from Nvidia, semiconductors, data centres and data center capex.",
+    "Budgets, fiscal deficits and the finance minister's capex; a trade deal, trade wars.",
+]
+
+
+def flat_pattern(phrases):
+    # The per-phrase alternation the trie replaces, longest phrase first.
+    return "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+
+
+def matches(pattern, text):
+    return [(m.span(), m.group(1)) for m in pattern.finditer(text)]
+
+
+class TriePatternTest(unittest.TestCase):
+    def compile_both(self, phrases):
+        wrap = r"\b({})(?:e?s)?\b"
+        return re.compile(wrap.format(trie_pattern(phrases))), re.compile(wrap.format(flat_pattern(phrases)))
+
+    def test_prefix_phrases_match_like_the_alternation(self):
+        trie, flat = self.compile_both(["rate", "rate cut", "rated", "ra", "repo rate", "interest rate"])
+        for text in TEXTS + ["ra rat rate rates rate cut rate cuts rate cutter rated rateds repo rates"]:
+            self.assertEqual(matches(trie, text), matches(flat, text), text)
+
+    def test_lexicon_matches_like_the_alternation(self):
+        flat = re.compile(r"\b(" + flat_pattern(PHRASE_TAGS) + r")(?:e?s)?\b")
+        texts = [text.lower() for text in TEXTS]
+        with open(os.path.join(ROOT, "blob", "index.json"), "r", encoding="utf-8") as f:
+            keys = [shard["key"] for shard in json.load(f)["shards"]]
+        for key in keys:
+            with open(os.path.join(ROOT, "blob", f"learnings-{key}.txt"), "r", encoding="utf-8") as f:
+                texts += [json.loads(line)["learning"].lower() for line in f]
+        for text in texts:
+            self.assertEqual(matches(PHRASE_RE, text), matches(flat, text))
+
+
+class FacetTest(unittest.TestCase):
+    def test_postings_are_listing_positions(self):
+        facets = build_facets([["tax"], [], ["tax", "trade"], ["trade"], ["trade"]])
+        self.assertEqual(
+            [(facet["tag"], facet["count"], facet["postings"]) for facet in facets],
+            [("trade", 3, [2, 3, 4]), ("tax", 2, [0, 2])],
+        )
+
+
+FILTER_HARNESS = r"""
+const touched = new Set();
+function item(i) {
+    const classes = new Set();
+    const record = (name) => { if (name === 'topic-match') touched.add(i); };
+    return { classList: {
+        add: (name) => { record(name); classes.add(name); },
+        remove: (name) => { record(name); classes.delete(name); },
+        contains: (name) => classes.has(name),
+    } };
+}
+const children = Array.from({ length: 10 }, (_, i) => item(i));
+const listClasses = new Set();
+const list = {
+    children,
+    childElementCount: children.length,
+    classList: { toggle: (name, on) => (on ? listClasses.add(name) : listClasses.delete(name)) },
+};
+const facets = { count: 10, topics: [{ tag: 'tax', postings: [0, 2, 4] }, { tag: 'trade', postings: [4, 7] }] };
+const document = { getElementById: () => list, querySelectorAll: () => [] };
+const history = { replaceState: () => {} };
+const location = { pathname: '/archive.html', search: '' };
+let activePostings = [];
+const loadTopics = async () => facets;
+FILTER_SOURCE
+function visible() {
+    return children.map((_, i) => i)
+        .filter((i) => !listClasses.has('is-filtered') || children[i].classList.contains('topic-match'));
+}
+(async () => {
+    const steps = [];
+    for (const topic of ['tax', 'trade', '', 'trade']) {
+        touched.clear();
+        await filterByTopic(topic);
+        steps.push({ topic, visible: visible(), touched: [...touched].sort((a, b) => a - b) });
+    }
+    console.log(JSON.stringify(steps));
+})();
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "needs node to run archive.html's script")
+class FilterByTopicTest(unittest.TestCase):
+    def test_switching_topics_touches_only_both_posting_lists(self):
+        with open(os.path.join(ROOT, "archive.html"), "r", encoding="utf-8") as f:
+            page = f.read()
+        source = re.search(r"\n( *)async function filterByTopic\(.*?\n\1}\n", page, re.S).group(0)
+        output = subprocess.run(
+            ["node", "-e", FILTER_HARNESS.replace("FILTER_SOURCE", source)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(json.loads(output), [
+            {"topic": "tax", "visible": [0, 2, 4], "touched": [0, 2, 4]},
+            {"topic": "trade", "visible": [4, 7], "touched": [0, 2, 4, 7]},
+            {"topic": "", "visible": list(range(10)), "touched": [4, 7]},
+            {"topic": "trade", "visible": [4, 7], "touched": [4, 7]},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Topic tags and the archive's facet index.
+
+Every learning is tagged from LEXICON, a hand-kept list of phrases per
+topic. All phrases are compiled into one regex, so tagging is a single
+pass over each title and body: a title hit scores TITLE_WEIGHT, a body hit
+1, and a learning takes the MAX_TOPICS best topics that reach MIN_SCORE.
+
+Tags are cached in TOPICS_STATE_PATH by record hash, so a publish only
+classifies new or edited learnings; editing LEXICON retags everything once.
+From the tags, TOPICS_PATH gets a posting list per topic: the positions of
+its learnings in store order, which is also the order of archive.html's
+listing. The archive's filter buttons and their counts are prerendered.
+A click marks the new posting list's items and unmarks the old one's, and
+a stylesheet rule hides the rest, so the cost is the two lists' length.
+
+    python3 topics.py    # tag counts, for tuning LEXICON
+"""
+
+import json
+import re
+from collections import Counter
+
+from build_graph import content_hash, write_if_changed
+
+
+TOPICS_PATH = "topics.json"
+TOPICS_STATE_PATH = "topics-state.json"
+TITLE_WEIGHT = 3
+MIN_SCORE = 3
+MAX_TOPICS = 3
+
+# tag: (label, phrases). Phrases are lowercase and also match with an
+# "s" or "es" ending.
+LEXICON = {
+    "budget": ("Budget & fiscal", (
+        "budget", "fiscal deficit", "fiscal", "finance minister", "government spending",
+        "public spending", "capex", "borrowing programme",
+    )),
+    "tax": ("Taxes", ("tax", "gst", "income tax", "excise", "customs duty", "cess")),
+    "trade": ("Trade", (
+        "trade deal", "trade war", "trade deficit", "free trade", "tariff", "export", "import",
+        "wto", "anti-dumping",
+    )),
+    "metals": ("Metals & mining", (
+        "copper", "steel", "steelmaker", "aluminium", "aluminum", "iron ore", "mining", "zinc",
+        "lithium", "metal", "smelter",
+    )),
+    "qsr": ("Restaurants & QSR", (
+        "qsr", "quick service restaurant", "restaurant", "dining out", "food delivery", "zomato",
+        "swiggy", "jubilant foodworks", "burger", "pizza",
+    )),
+    "energy": ("Energy", (
+        "oil", "crude", "lpg", "natural gas", "solar", "hydropower", "renewable", "electricity",
+        "coal", "power plant", "battery", "batteries",
+    )),
+    "autos": ("Autos & EVs", (
+        "carmaker", "automaker", "car", "maruti", "tata motors", "electric vehicle", "ev",
+        "two-wheeler", "automobile",
+    )),
+    "tech": ("Tech & AI", (
+        "ai", "artificial intelligence", "chip", "semiconductor", "nvidia", "software",
+        "it services", "tcs", "infosys", "data centre", "data center", "cloud",
+    )),
+    "banking": ("Banking & credit", (
+        "bank", "banking", "rbi", "loan", "credit", "deposit", "lending", "nbfc", "interest rate",
+        "repo rate", "upi",
+    )),
+    "markets": ("Markets & IPOs", (
+        "ipo", "stock market", "sebi", "investor", "mutual fund", "nifty", "sensex", "listing",
+        "algo trading", "shareholder", "valuation",
+    )),
+    "china": ("China", ("china", "chinese", "beijing")),
+    "consumer": ("Consumer & retail", (
+        "fmcg", "consumer", "brand", "premiumisation", "premiumization", "retail", "quick commerce",
+        "dmart", "amul", "nestle", "soft drink", "beverage", "dairy",
+    )),
+    "health": ("Healthcare & pharma", (
+        "pharma", "hospital", "drug", "diagnostic", "healthcare", "biotech", "glp-1", "patient",
+    )),
+    "realty": ("Real estate & infra", (
+        "cement", "real estate", "housing", "infrastructure", "construction", "office space",
+        "co-working",
+    )),
+    "telecom": ("Telecom & internet", (
+        "telecom", "jio", "airtel", "satellite", "starlink", "broadband", "internet",
+    )),
+    "climate": ("Climate", ("climate", "emission", "carbon", "net zero", "decarbonisation")),
+}
+
+PHRASE_TAGS = {phrase: tag for tag, (_, phrases) in LEXICON.items() for phrase in phrases}
+
+
+def trie_pattern(phrases):
+    """A regex matching any of ``phrases``, factored on common prefixes.
+
+    A flat alternation makes the regex engine try every phrase at every
+    position. Branching on one character at a time is several times faster,
+    and the greedy optional tails still prefer the longest phrase, so
+    "income tax" wins over "tax".
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+PHRASE_RE = re.compile(r"\b(" + trie_pattern(PHRASE_TAGS) + r")(?:e?s)?\b")
+
+
+def lexicon_hash():
+    return content_hash([LEXICON, TITLE_WEIGHT, MIN_SCORE, MAX_TOPICS])
+
+
+def classify(learning):
+    scores = Counter()
+    for match in PHRASE_RE.finditer((learning.title or "").lower()):
+        scores[PHRASE_TAGS[match.group(1)]] += TITLE_WEIGHT
+    for match in PHRASE_RE.finditer((learning.learning or "").lower()):
+        scores[PHRASE_TAGS[match.group(1)]] += 1
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return sorted(tag for tag, score in ranked[:MAX_TOPICS] if score >= MIN_SCORE)
+
+
+def load_state(path=TOPICS_STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("lexicon") == lexicon_hash():
+            return state["tags"]
+    except (FileNotFoundError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def tag_learnings(learnings, hashes):
+    """Tags for each learning, classifying only those not in the cache."""
+    cached = load_state()
+    tags = []
+    for learning, digest in zip(learnings, hashes):
+        if digest not in cached:
+            cached[digest] = classify(learning)
+        tags.append(cached[digest])
+    return tags
+
+
+def build_facets(tags):
+    """Posting lists and counts per topic, most common first."""
+    postings = {tag: [] for tag in LEXICON}
+    for position, learning_tags in enumerate(tags):
+        for tag in learning_tags:
+            postings[tag].append(position)
+    ranked = sorted((tag for tag in LEXICON if postings[tag]), key=lambda tag: (-len(postings[tag]), tag))
+    return [
+        {"tag": tag, "label": LEXICON[tag][0], "count": len(postings[tag]), "postings": postings[tag]}
+        for tag in ranked
+    ]
+
+
+def render_facets(facets, count):
+    # One topic per line keeps the daily diff readable.
+    lines = ",\n".join("  " + json.dumps(facet, ensure_ascii=False, separators=(",", ":")) for facet in facets)
+    return f'{{"count":{count},"topics":[\n{lines}\n]}}\n'
+
+
+def publish_topics(graph, learnings, hashes):
+    """Tag ``learnings`` and build TOPICS_PATH; returns (facets, written state paths)."""
+    tags = tag_learnings(learnings, hashes)
+    facets = build_facets(tags)
+    deps = [content_hash(facets), str(len(learnings))]
+    graph.build(TOPICS_PATH, deps, lambda: render_facets(facets, len(learnings)))
+    state = {"lexicon": lexicon_hash(), "tags": dict(zip(hashes, tags))}
+    written = []
+    if write_if_changed(TOPICS_STATE_PATH, json.dumps(state, separators=(",", ":"), sort_keys=True) + "\n"):
+        written.append(TOPICS_STATE_PATH)
+    return facets, written
+
+
+def main():
+    from store import load_learnings
+
+    learnings = load_learnings()
+    tags = [classify(learning) for learning in learnings]
+    for facet in build_facets(tags):
+        print(f"{facet['count']:6d}  {facet['tag']:10s} {facet['label']}")
+    print(f"{sum(1 for t in tags if not t):6d}  untagged, of {len(learnings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Watch mode: poll every source's archive and ingest new posts as they appear.
+
+    python3 dailylearnings.py watch --interval 60 --exec "./deploy.sh"
+
+The store, the known-URL set and each archive's validators stay in memory
+between polls. A poll is one conditional GET of the newest archive page per
+source. An unchanged archive answers 304 with no body, so an idle poll costs
+one round trip and no parsing. Servers without validators are compared
+against the last body instead. Anything new is fetched, extracted, saved and
+published straight away, and then the --exec command runs, for example to
+commit and push the site.
+"""
+
+import json
+import os
+import random
+import subprocess
+import time
+
+from dates import normalize_date
+from failures import FailedQueue
+from http_client import Validators, fetch
+from parse_guard import quarantine
+from process_new import process_url
+from publish import publish
+from related import update_related
+from sources import get_sources
+from store import insert_learning, load_learnings, save_learnings
+
+
+WATCH_INTERVAL = float(os.environ.get("WATCH_INTERVAL", 60))
+# Entries per poll: enough to catch a burst of posts between polls.
+POLL_LIMIT = 5
+# Polls back off up to this long while an archive keeps failing.
+MAX_BACKOFF = 900
+
+
+class Watcher:
+    def __init__(self, sources=None, hook=None):
+        self.sources = sources or get_sources()
+        self.hook = hook
+        self.learnings = load_learnings()
+        self.known = {item.article_url for item in self.learnings} | quarantine.urls()
+        self.failed = FailedQueue()
+        self.validators = {source.name: Validators() for source in self.sources}
+        self.last_body = {}
+
+    def poll_source(self, source):
+        """Entries from the newest archive page of ``source`` not yet in the store."""
+        url = source.archive_url.format(limit=POLL_LIMIT, offset=0)
+        body = fetch(url, retries=1, validators=self.validators[source.name])
+        if body is None or body == self.last_body.get(source.name):
+            return []
+        self.last_body[source.name] = body
+        entries = json.loads(body)
+        return [
+            {"canonical_url": entry["canonical_url"], "post_date": normalize_date(entry.get("post_date"))}
+            for entry in entries if isinstance(entry, dict)
+            if entry.get("canonical_url") and entry["canonical_url"] not in self.known
+        ]
+
+    def ingest(self, targets):
+        added = 0
+        for target in targets:
+            url = target["canonical_url"]
+            try:
+                learning = process_url(url, target.get("post_date", ""))
+            except Exception as error:
+                self.failed.record(url, error, target.get("post_date", ""))
+                print(f"Failed to fetch {url}: {error}")
+                continue
+            self.failed.resolve(url)
+            # Known even without a learning, so an empty page isn't fetched every poll.
+            self.known.add(url)
+            if learning:
+                insert_learning(self.learnings, learning)
+                added += 1
+                print(f"Added {learning.title or url}")
+
+        self.failed.save()
+        if added:
+            update_related(self.learnings)
+            save_learnings(self.learnings)
+            publish(self.learnings)
+            self.run_hook()
+        return added
+
+    def run_hook(self):
+        if not self.hook:
+            return
+        result = subprocess.run(self.hook, shell=True)
+        if result.returncode:
+            print(f"--exec command exited with {result.returncode}")
+
+    def poll(self):
+        """Poll every source once; returns (learnings added, sources that failed)."""
+        # Failed fetches are retried each poll until FailedQueue gives up on them.
+        targets = {}
+        for target in self.failed.pending():
+            if target["canonical_url"] in self.known:
+                self.failed.resolve(target["canonical_url"])
+            else:
+                targets[target["canonical_url"]] = target
+        errors = 0
+        for source in self.sources:
+            try:
+                for target in self.poll_source(source):
+                    targets.setdefault(target["canonical_url"], target)
+            except Exception as error:
+                errors += 1
+                print(f"Could not poll the {source.name} archive: {error}")
+        return (self.ingest(list(targets.values())) if targets else 0), errors
+
+
+def watch(interval=WATCH_INTERVAL, hook=None, polls=0):
+    watcher = Watcher(hook=hook)
+    print(f"Watching {len(watcher.sources)} source(s) every {interval:g}s "
+          f"({len(watcher.learnings)} learnings in the store).")
+    delay = interval
+    count = 0
+    try:
+        while True:
+            _, errors = watcher.poll()
+            count += 1
+            if polls and count >= polls:
+                break
+            delay = min(MAX_BACKOFF, delay * 2) if errors else interval
+            # A little jitter keeps several watchers from polling in lockstep.
+            time.sleep(delay * random.uniform(0.9, 1.1))
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    return watcher